@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: pickled model/scaler vs the pickle-free artifact directory
+
+Each sample is a fresh interpreter that imports the repository and LightGBM,
+then loads the model bundle and warms it up. Imports and load are reported
+separately, since importing LightGBM (and the scikit-learn it pulls in) costs
+the same for both formats. Run from the repository root after
+``python export_model_artifact.py``:
+    python benchmarks/bench_cold_start.py [--repeat 10] [--artifact-dir models/artifact]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+CHILD = '''
+import json, os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+from repositories.model_repository import ModelRepository
+import lightgbm  # needed by both formats; imports scikit-learn/scipy when installed
+imported = time.perf_counter()
+ModelRepository.ARTIFACT_DIR = os.path.abspath({artifact_dir!r})
+if not ModelRepository.start():
+    sys.exit("model bundle failed to load")
+done = time.perf_counter()
+print(json.dumps({{"import": imported - start, "load": done - imported}}))
+'''
+
+def run_once(model_format, artifact_dir):
+    env = dict(os.environ, GLUCOTRACK_MODEL_FORMAT=model_format)
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD.format(src=SRC_DIR, artifact_dir=artifact_dir)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    wall = time.perf_counter() - start
+    timings = json.loads(output.strip().splitlines()[-1])
+    return wall, timings['import'], timings['load']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='Fresh processes per format')
+    parser.add_argument('--artifact-dir', default='models/artifact', help='Artifact directory to load')
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.artifact_dir, 'manifest.json')):
+        sys.exit(f"No artifact manifest in {args.artifact_dir} - run export_model_artifact.py first")
+
+    print(f"{'format':>9} | {'process ms':>10} | {'imports ms':>10} | {'load+warm ms':>12}")
+    print('-' * 52)
+    results = {}
+    for model_format in ('pickle', 'artifact'):
+        run_once(model_format, args.artifact_dir)  # page cache warm-up
+        samples = np.array([run_once(model_format, args.artifact_dir) for _ in range(args.repeat)]) * 1000
+        wall, imports, load = np.median(samples, axis=0)
+        results[model_format] = load
+        print(f"{model_format:>9} | {wall:10.1f} | {imports:10.1f} | {load:12.1f}")
+    print(f"\nModel load + warm-up (median of {args.repeat}): pickle {results['pickle']:.1f} ms, "
+          f"artifact {results['artifact']:.1f} ms ({results['pickle'] / results['artifact']:.2f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Overhead of the per-stage request telemetry
+
+Measures what one instrumented request pays: binding its StageTimings, the
+stage marks a /predict request makes, and recording them into the
+histograms. Also times PredictionService.predict_single with and without a
+bound StageTimings (marks are no-ops without one).
+
+Run from the repository root:
+    python benchmarks/bench_telemetry.py [--repeat 20000]
+"""
+import argparse
+import contextvars
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from services import telemetry
+
+# The stages a cache-missing /predict request marks, in order
+PREDICT_STAGES = ["parse", "queue", "cache", "encode", "scale", "inference", "decide", "serialize"]
+
+def median_us(fn, repeat):
+    """Median wall time of fn() in microseconds"""
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1e6
+
+def instrumented_request():
+    def request():
+        timings = telemetry.start_request()
+        for stage in PREDICT_STAGES:
+            telemetry.mark(stage)
+        telemetry.observe("/api/v1/predict", timings, 200)
+    contextvars.Context().run(request)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20000, help='Timed calls per measurement')
+    args = parser.parse_args()
+
+    empty = median_us(lambda: contextvars.Context().run(lambda: None), args.repeat)
+    overhead = median_us(instrumented_request, args.repeat) - empty
+    print(f"Telemetry per /predict request ({len(PREDICT_STAGES)} stages): {overhead:.2f} us")
+
+    from models.health import InputFeatures
+    from services.prediction_service import PredictionService, prediction_cache
+    features = InputFeatures(
+        gender="Female", age=45.0, hypertension=0, heart_disease=0,
+        smoking_history="never", bmi=28.5, HbA1c_level=6.2, blood_glucose_level=140.0
+    )
+    prediction_cache.max_size = 0  # time the full pipeline, not cache hits
+
+    def bare():
+        contextvars.Context().run(PredictionService.predict_single, features)
+
+    def instrumented():
+        def request():
+            timings = telemetry.start_request()
+            PredictionService.predict_single(features)
+            telemetry.observe("/api/v1/predict", timings, 200)
+        contextvars.Context().run(request)
+
+    repeat = max(1, args.repeat // 10)
+    bare_us = median_us(bare, repeat)
+    instrumented_us = median_us(instrumented, repeat)
+    print(f"predict_single: {bare_us:.1f} us bare, {instrumented_us:.1f} us instrumented "
+          f"({instrumented_us - bare_us:+.1f} us)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark: native numpy tree engine vs stock LightGBM scoring
+
+Run from the repository root:
+    python benchmarks/bench_tree_engine.py [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from ml.tree_engine import LightGBMEngine, TreeEnsembleEngine
+
+MODEL_PATH = 'models/lgbm_best_model.pkl'
+X_TEST_PATH = 'data/processed/X_test_ml.csv'
+BATCH_SIZES = [1, 10, 100, 1000]
+
+def time_call(fn, X, repeat):
+    """Median wall time of fn(X) in microseconds"""
+    fn(X)  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help='Timed calls per batch size')
+    args = parser.parse_args()
+
+    model = joblib.load(MODEL_PATH)
+    X_test = pd.read_csv(X_TEST_PATH)
+    X_test.columns = model.feature_name_
+    X_all = X_test.to_numpy(dtype=np.float64)
+    if len(X_all) < max(BATCH_SIZES):
+        X_all = np.resize(X_all, (max(BATCH_SIZES), X_all.shape[1]))
+
+    stock = LightGBMEngine(model)
+    native = TreeEnsembleEngine(model)
+    engines = {
+        'predict_proba': lambda X: model.predict_proba(pd.DataFrame(X, columns=model.feature_name_))[:, 1],
+        'booster': stock.score,
+        'native': native.score,
+    }
+
+    print(f"Model: {native.n_trees} trees, max depth {native.max_depth}")
+    header = f"{'batch':>6} " + " ".join(f"{name + ' (us)':>20}" for name in engines)
+    header += f" {'vs predict_proba':>17} {'vs booster':>11}"
+    print(header)
+    print("-" * len(header))
+    for size in BATCH_SIZES:
+        X = X_all[:size]
+        timings = {name: time_call(fn, X, args.repeat) for name, fn in engines.items()}
+        row = f"{size:>6} " + " ".join(f"{timings[name]:>20.1f}" for name in engines)
+        row += f" {timings['predict_proba'] / timings['native']:>16.2f}x"
+        print(row + f" {timings['booster'] / timings['native']:>10.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Load test for the GlucoTrack API
+
+Drives the FastAPI app from src/main.py in process through an ASGI
+transport (the default), through a local uvicorn server started on a free
+port (--target uvicorn, which includes HTTP parsing and the socket), or
+against an already running server (--url). Requests come from a corpus
+file or a generated corpus, and are sent either by --concurrency closed-loop
+clients or at a fixed --rate of arrivals per second. With --rate, latency is
+measured from the scheduled arrival time, so a backed-up server shows up in
+the percentiles instead of silently lowering the offered load.
+
+A corpus is JSON Lines, one request per line:
+
+    {"method": "POST", "path": "/api/v1/predict", "json": {...}, "headers": {"X-Model-Version": "v2"}}
+
+The generated corpus mixes /predict, /batch-predict and /data/validate-batch
+requests (--mix) with synthetic patients; --save-corpus writes it for replay.
+The report gives throughput, errors and p50/p95/p99 latency per endpoint,
+and the median of each server-side stage from the Server-Timing headers.
+
+Run from the repository root:
+    python benchmarks/load_test.py --synthetic-model --requests 2000 --concurrency 16
+    python benchmarks/load_test.py --target uvicorn --rate 200 --duration 30
+    python benchmarks/load_test.py --corpus corpus.jsonl --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import httpx
+
+from run_benchmarks import environment, synthetic_patients, train_artifacts
+
+DEFAULT_MIX = 'predict=8,batch-predict=1,validate-batch=1'
+ENDPOINT_PATHS = {
+    'predict': '/api/v1/predict',
+    'batch-predict': '/api/v1/batch-predict',
+    'validate-batch': '/api/v1/data/validate-batch',
+}
+
+def parse_mix(mix):
+    """'predict=8,batch-predict=1' -> {'predict': 8.0, 'batch-predict': 1.0}"""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINT_PATHS:
+            raise ValueError(f"Unknown endpoint in --mix: {name} (choose from {', '.join(ENDPOINT_PATHS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+def generate_corpus(n_requests, mix, batch_size, seed=7):
+    """Requests over synthetic patients, drawn from the endpoint mix"""
+    patients = (
+        synthetic_patients(max(n_requests, batch_size) * 2, seed=seed)
+        .drop('diabetes', axis=1)
+        .assign(gender=lambda frame: frame['gender'].replace('Other', 'Female'))
+        .to_dict('records')
+    )
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    corpus = []
+    for _ in range(n_requests):
+        name = rng.choices(names, weights)[0]
+        if name == 'predict':
+            body = rng.choice(patients)
+        else:
+            start = rng.randrange(len(patients) - batch_size + 1)
+            rows = patients[start:start + batch_size]
+            body = {'data': rows} if name == 'batch-predict' else rows
+        corpus.append({'method': 'POST', 'path': ENDPOINT_PATHS[name], 'json': body})
+    return corpus
+
+def load_corpus(path):
+    with open(path) as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    for number, entry in enumerate(corpus, 1):
+        if 'path' not in entry:
+            raise ValueError(f"{path}:{number}: corpus entries need a path")
+    return corpus
+
+def save_corpus(path, corpus):
+    with open(path, 'w') as f:
+        for entry in corpus:
+            f.write(json.dumps(entry) + '\n')
+
+def endpoint_label(entry):
+    return f"{entry.get('method', 'POST').upper()} {entry['path'].split('?')[0]}"
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@asynccontextmanager
+async def open_client(target, url, timeout):
+    """An httpx client for the chosen target, with the app's lifespan run when it is in process"""
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+            yield client
+        return
+
+    from main import app
+
+    if target == 'asgi':
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=timeout) as client:
+                yield client
+        return
+
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    thread = threading.Thread(target=server.run, name='loadtest-uvicorn', daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("uvicorn exited during startup")
+            await asyncio.sleep(0.05)
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', timeout=timeout, limits=limits) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await asyncio.to_thread(thread.join, 10)
+
+def parse_server_timing(header):
+    """'parse;dur=0.4, total;dur=1.6' -> {'parse': 0.4, 'total': 1.6} (milliseconds)"""
+    stages = {}
+    for metric in header.split(','):
+        name, *params = metric.strip().split(';')
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'dur':
+                try:
+                    stages[name.strip()] = float(value)
+                except ValueError:
+                    pass
+    return stages
+
+class Recorder:
+    """Latencies, status counts and Server-Timing stages per endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.stages = defaultdict(lambda: defaultdict(list))
+
+    def record(self, label, status, seconds, server_timing=None):
+        self.latencies[label].append(seconds)
+        self.statuses[label][status] += 1
+        if server_timing:
+            for stage, milliseconds in parse_server_timing(server_timing).items():
+                self.stages[label][stage].append(milliseconds)
+
+    def report(self, elapsed):
+        endpoints = {}
+        for label in sorted(self.latencies):
+            latencies = np.array(self.latencies[label]) * 1000
+            statuses = self.statuses[label]
+            errors = sum(count for status, count in statuses.items() if not 200 <= status < 300)
+            endpoints[label] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'statuses': {str(status): count for status, count in sorted(statuses.items())},
+                'throughput_rps': len(latencies) / elapsed,
+                'p50_ms': float(np.percentile(latencies, 50)),
+                'p95_ms': float(np.percentile(latencies, 95)),
+                'p99_ms': float(np.percentile(latencies, 99)),
+                'max_ms': float(latencies.max()),
+                'server_stages_p50_ms': {
+                    stage: float(np.median(values)) for stage, values in self.stages[label].items()
+                },
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            'elapsed_seconds': elapsed,
+            'requests': total,
+            'errors': sum(endpoint['errors'] for endpoint in endpoints.values()),
+            'throughput_rps': total / elapsed if elapsed > 0 else 0.0,
+            'endpoints': endpoints,
+        }
+
+async def send(client, entry, recorder, started):
+    """Send one corpus entry; status 0 marks a transport error or timeout"""
+    try:
+        response = await client.request(
+            entry.get('method', 'POST'),
+            entry['path'],
+            json=entry.get('json'),
+            headers=entry.get('headers')
+        )
+        await response.aread()
+        status = response.status_code
+        server_timing = response.headers.get('server-timing')
+    except httpx.HTTPError:
+        status = 0
+        server_timing = None
+    if recorder is not None:
+        recorder.record(endpoint_label(entry), status, time.perf_counter() - started, server_timing)
+
+async def run_closed(client, requests, concurrency, recorder):
+    """`concurrency` clients that each send their next request as soon as the last one returns"""
+    iterator = iter(requests)
+
+    async def worker():
+        for entry in iterator:
+            await send(client, entry, recorder, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+async def run_open(client, requests, rate, max_in_flight, recorder):
+    """Requests arrive every 1/rate seconds; latency counts from the scheduled arrival"""
+    slots = asyncio.Semaphore(max_in_flight)
+    tasks = []
+
+    async def scheduled(entry, arrival):
+        async with slots:
+            await send(client, entry, recorder, arrival)
+
+    start = time.perf_counter()
+    for index, entry in enumerate(requests):
+        arrival = start + index / rate
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(scheduled(entry, arrival)))
+    await asyncio.gather(*tasks)
+
+def cycle(corpus, count):
+    return (corpus[index % len(corpus)] for index in range(count))
+
+def until(corpus, deadline):
+    """The corpus, cycled until the deadline passes"""
+    index = 0
+    while time.perf_counter() < deadline:
+        yield corpus[index % len(corpus)]
+        index += 1
+
+async def run(args, corpus):
+    timeout = httpx.Timeout(args.timeout)
+    async with open_client(args.target, args.url, timeout) as client:
+        if args.warmup:
+            await run_closed(client, cycle(corpus, args.warmup), args.concurrency, None)
+
+        if args.duration:
+            count = int(args.duration * args.rate) if args.rate else None
+        else:
+            count = args.requests or len(corpus)
+        recorder = Recorder()
+        start = time.perf_counter()
+        requests = cycle(corpus, count) if count is not None else until(corpus, start + args.duration)
+        if args.rate:
+            await run_open(client, requests, args.rate, args.concurrency, recorder)
+        else:
+            await run_closed(client, requests, args.concurrency, recorder)
+        return recorder.report(time.perf_counter() - start)
+
+def print_report(report):
+    print(f"\n{'endpoint':<34} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9}")
+    for label, endpoint in report['endpoints'].items():
+        print(f"{label:<34} {endpoint['requests']:>9,} {endpoint['errors']:>7,} {endpoint['throughput_rps']:>9,.1f} "
+              f"{endpoint['p50_ms']:>9.2f} {endpoint['p95_ms']:>9.2f} {endpoint['p99_ms']:>9.2f} {endpoint['max_ms']:>9.2f}")
+    print(f"{'total':<34} {report['requests']:>9,} {report['errors']:>7,} {report['throughput_rps']:>9,.1f}")
+    stages = {label: endpoint['server_stages_p50_ms'] for label, endpoint in report['endpoints'].items()
+              if endpoint['server_stages_p50_ms']}
+    if stages:
+        print("\nServer-Timing medians (ms):")
+        for label, medians in stages.items():
+            print(f"  {label:<32} " + "  ".join(f"{stage} {value:.3f}" for stage, value in medians.items()))
+    for label, endpoint in report['endpoints'].items():
+        failed = {status: count for status, count in endpoint['statuses'].items() if not status.startswith('2')}
+        if failed:
+            print(f"⚠️  {label}: {', '.join(f'{count:,} x {status}' for status, count in failed.items())}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--target', choices=['asgi', 'uvicorn'], default='asgi',
+                        help='In-process ASGI transport or a local uvicorn server (default: asgi)')
+    parser.add_argument('--url', help='Base URL of a running server; overrides --target')
+    parser.add_argument('--corpus', help='JSON Lines request corpus to replay (default: generate one)')
+    parser.add_argument('--save-corpus', help='Write the generated corpus to this file')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Endpoint weights of the generated corpus (default: {DEFAULT_MIX})')
+    parser.add_argument('--batch-size', type=int, default=100, help='Patients per generated batch request (default: 100)')
+    parser.add_argument('--requests', type=int, help='Requests to send, cycling the corpus (default: corpus size)')
+    parser.add_argument('--duration', type=float, help='Send for this many seconds instead of --requests')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Closed-loop clients, or the in-flight limit with --rate (default: 8)')
+    parser.add_argument('--rate', type=float, help='Open-loop arrivals per second instead of closed-loop clients')
+    parser.add_argument('--warmup', type=int, default=50, help='Unrecorded requests sent first (default: 50)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds (default: 30)')
+    parser.add_argument('--synthetic-model', action='store_true',
+                        help='Serve a model trained on synthetic data instead of models/ (in-process targets only)')
+    parser.add_argument('--output', help='Also write the report as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = generate_corpus(args.requests or 2000, mix, args.batch_size)
+        if args.save_corpus:
+            save_corpus(args.save_corpus, corpus)
+            print(f"💾 Corpus written to {args.save_corpus}")
+    if not corpus:
+        parser.error("The corpus is empty")
+
+    with tempfile.TemporaryDirectory(prefix='glucotrack-load-') as directory:
+        if args.synthetic_model and not args.url:
+            print("🏋️  Training synthetic model...")
+            artifact_dir = os.path.join(directory, 'artifact')
+            train_artifacts(artifact_dir, 20_000, 500)
+            registry_path = os.path.join(directory, 'registry.json')
+            with open(registry_path, 'w') as f:
+                json.dump({'models': [{'version': 'loadtest', 'artifact_dir': artifact_dir}]}, f)
+            from repositories.model_repository import ModelRepository
+            ModelRepository.REGISTRY_PATH = registry_path
+
+        target = args.url or args.target
+        load = f"{args.rate:g} req/s (at most {args.concurrency} in flight)" if args.rate else f"{args.concurrency} clients"
+        print(f"🔥 Load testing {target} with {load}, corpus of {len(corpus):,} requests")
+        report = asyncio.run(run(args, corpus))
+
+    print_report(report)
+    if args.output:
+        report.update({
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'environment': environment(),
+            'config': {key: value for key, value in vars(args).items() if key not in ('output', 'save_corpus')},
+        })
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.output}")
+    return 1 if report['requests'] and report['errors'] == report['requests'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
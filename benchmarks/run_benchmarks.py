@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the inference pipeline
+
+Trains a LightGBM model and StandardScaler on synthetic data shaped like the
+diabetes dataset (same columns, one-hot layout and model size), loads them
+through ModelRepository from a temporary artifact directory, and times:
+
+    preprocess_features                    one patient
+    predict_single                         one patient, prediction cache off
+    predict_batch/{1,10,100,1000}          PredictionService.predict_batch, cache off
+    validate_batch/{1,10,100,1000}         ValidationService.validate_batch
+
+No data or model files are needed. Results are written as JSON; with a
+baseline file, every benchmark is compared against it and the run exits
+with status 1 when one regressed by more than --threshold, or with status
+2 without comparing when the baseline was recorded with other --trees,
+--train-rows, --samples or --min-sample-ms. Comparisons use
+the fastest sample by default (``--statistic min``): on a shared machine
+it is far more stable than the median, since noise only ever adds time.
+Samples are spread over --rounds interleaved passes, so a slow phase of
+the machine is shared by all benchmarks instead of skewing one of them.
+Baselines are machine-specific and are not committed.
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py --save-baseline       # record a baseline
+    python benchmarks/run_benchmarks.py                       # compare against it
+    python benchmarks/run_benchmarks.py --threshold 0.10 --filter predict_batch
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+# Settings that change what is measured: the model's size and how samples are taken
+COMPARABLE_CONFIG = ('train_rows', 'trees', 'samples', 'min_sample_ms')
+BATCH_SIZES = [1, 10, 100, 1000]
+
+GENDERS = ['Female', 'Male', 'Other']
+SMOKING = ['No Info', 'current', 'ever', 'former', 'never', 'not current']
+NUMERIC_COLS = ['age', 'bmi', 'HbA1c_level', 'blood_glucose_level']
+
+def synthetic_patients(n_rows, seed=42):
+    """Raw patient rows with the diabetes dataset's columns and rough marginals"""
+    rng = np.random.default_rng(seed)
+    age = np.clip(rng.normal(42, 22, n_rows), 0.1, 80).round(1)
+    bmi = np.clip(rng.normal(27.3, 6.6, n_rows), 10, 80).round(2)
+    hba1c = np.clip(rng.normal(5.5, 1.1, n_rows), 3.5, 9).round(1)
+    glucose = np.clip(rng.normal(138, 40, n_rows), 80, 300).round()
+    hypertension = (rng.random(n_rows) < 0.02 + age / 800).astype(int)
+    heart_disease = (rng.random(n_rows) < 0.01 + age / 1600).astype(int)
+    frame = pd.DataFrame({
+        'gender': rng.choice(GENDERS, n_rows, p=[0.585, 0.414, 0.001]),
+        'age': age,
+        'hypertension': hypertension,
+        'heart_disease': heart_disease,
+        'smoking_history': rng.choice(SMOKING, n_rows, p=[0.36, 0.09, 0.04, 0.09, 0.35, 0.07]),
+        'bmi': bmi,
+        'HbA1c_level': hba1c,
+        'blood_glucose_level': glucose,
+    })
+    # Risk driven by HbA1c and glucose, like the real data, plus age and comorbidities
+    logit = (
+        2.2 * (hba1c - 6.0) + 0.025 * (glucose - 150) + 0.03 * (age - 50)
+        + 0.6 * hypertension + 0.6 * heart_disease + 0.05 * (bmi - 27) - 2.0
+    )
+    frame['diabetes'] = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(int)
+    return frame
+
+def train_artifacts(directory, n_rows, n_estimators):
+    """Fit the scaler and model the way preprocess_data.py/train_lgbm.py do and write artifacts"""
+    from lightgbm import LGBMClassifier
+    from sklearn.preprocessing import StandardScaler
+    from ml.artifacts import write_model, write_scaler
+
+    data = synthetic_patients(n_rows)
+    X = pd.get_dummies(data.drop('diabetes', axis=1), columns=['gender', 'smoking_history'], drop_first=True)
+    X = X.astype({column: np.float64 for column in X.columns})
+    scaler = StandardScaler()
+    X[NUMERIC_COLS] = scaler.fit_transform(X[NUMERIC_COLS])
+    model = LGBMClassifier(n_estimators=n_estimators, num_leaves=31, random_state=42, n_jobs=1, verbose=-1)
+    model.fit(X, data['diabetes'])
+    write_scaler(directory, scaler)
+    write_model(directory, model)
+
+def calibrate(fn, min_sample_seconds):
+    """Calls per sample so that one sample lasts at least min_sample_seconds"""
+    fn()  # warm-up
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_sample_seconds or loops >= 1_000_000:
+            return loops
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_sample_seconds / elapsed) + 1))
+
+def sample(fn, loops, samples):
+    """Per-call wall times in microseconds, with the garbage collector paused"""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        per_call = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            per_call.append((time.perf_counter() - start) / loops * 1e6)
+        return per_call
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def summarize(per_call, loops, rows):
+    per_call = np.array(per_call)
+    median = float(np.median(per_call))
+    return {
+        'median_us': median,
+        'min_us': float(per_call.min()),
+        'p95_us': float(np.percentile(per_call, 95)),
+        'loops': loops,
+        'samples': len(per_call),
+        'rows': rows,
+        'rows_per_second': rows / median * 1e6,
+    }
+
+def benchmarks():
+    """(name, rows per call, zero-argument callable) for every benchmark"""
+    from models.health import InputFeatures
+    from models.batch import BatchPredictionRequest
+    from services.prediction_service import PredictionService
+    from services.validation_service import ValidationService
+
+    patients = [
+        InputFeatures(**row)
+        for row in synthetic_patients(max(BATCH_SIZES), seed=7)
+        .drop('diabetes', axis=1)
+        .assign(gender=lambda frame: frame['gender'].replace('Other', 'Female'))
+        .to_dict('records')
+    ]
+    single = patients[0]
+    cases = [
+        ('preprocess_features', 1, lambda: PredictionService.preprocess_features(single)),
+        ('predict_single', 1, lambda: PredictionService.predict_single(single)),
+    ]
+    for size in BATCH_SIZES:
+        request = BatchPredictionRequest(data=patients[:size])
+        cases.append((f'predict_batch/{size}', size, lambda request=request: PredictionService.predict_batch(request)))
+    for size in BATCH_SIZES:
+        subset = patients[:size]
+        cases.append((f'validate_batch/{size}', size, lambda subset=subset: ValidationService.validate_batch(subset)))
+    return cases
+
+def compare(results, baseline, threshold, statistic):
+    """Annotate results with the baseline value and ratio; return the names that regressed"""
+    regressions = []
+    key = f'{statistic}_us'
+    for name, result in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        ratio = result[key] / previous[key]
+        result['baseline_us'] = previous[key]
+        result['ratio'] = ratio
+        result['regressed'] = ratio > 1 + threshold
+        if result['regressed']:
+            regressions.append(name)
+    return regressions
+
+def config_mismatch(config, baseline):
+    """Settings in COMPARABLE_CONFIG that differ from the baseline's, as name -> (baseline, current)"""
+    recorded = baseline.get('config', {})
+    return {
+        name: (recorded.get(name), config[name])
+        for name in COMPARABLE_CONFIG
+        if recorded.get(name) != config[name]
+    }
+
+def environment():
+    import lightgbm
+    from config import Settings
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'lightgbm': lightgbm.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'inference_engine': Settings.INFERENCE_ENGINE,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'Results JSON (default: {os.path.relpath(DEFAULT_OUTPUT)})')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help=f'Baseline JSON to compare against (default: {os.path.relpath(DEFAULT_BASELINE)})')
+    parser.add_argument('--save-baseline', action='store_true', help='Also write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Fail when a benchmark is more than this fraction slower than the baseline (default: 0.25)')
+    parser.add_argument('--statistic', choices=['min', 'median'], default='min',
+                        help='Per-benchmark value compared against the baseline (default: min)')
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--samples', type=int, default=15, help='Timed samples per benchmark (default: 15)')
+    parser.add_argument('--rounds', type=int, default=5, help='Interleaved rounds the samples are spread over (default: 5)')
+    parser.add_argument('--min-sample-ms', type=float, default=20.0, help='Minimum duration of one sample (default: 20)')
+    parser.add_argument('--train-rows', type=int, default=20_000, help='Synthetic training rows (default: 20000)')
+    parser.add_argument('--trees', type=int, default=500, help='Boosting rounds of the synthetic model (default: 500)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='glucotrack-bench-') as directory:
+        print(f"🏋️  Training synthetic model ({args.train_rows:,} rows, {args.trees} trees)...")
+        artifact_dir = os.path.join(directory, 'artifact')
+        train_artifacts(artifact_dir, args.train_rows, args.trees)
+        registry_path = os.path.join(directory, 'registry.json')
+        with open(registry_path, 'w') as f:
+            json.dump({'models': [{'version': 'bench', 'artifact_dir': artifact_dir}]}, f)
+
+        from repositories.model_repository import ModelRepository
+        ModelRepository.REGISTRY_PATH = registry_path
+        if not ModelRepository.reload_model():
+            print("❌ Synthetic model could not be loaded")
+            return 2
+
+        # Time the pipeline itself, not cache hits
+        from services.prediction_service import prediction_cache
+        prediction_cache.max_size = 0
+
+        cases = [case for case in benchmarks() if args.filter in case[0]]
+        loops = {name: calibrate(fn, args.min_sample_ms / 1000.0) for name, _, fn in cases}
+        # Rounds interleave the benchmarks, so a slow phase of the machine does
+        # not land on all samples of one benchmark
+        per_call = {name: [] for name, _, _ in cases}
+        rounds = max(1, min(args.rounds, args.samples))
+        for round_index in range(rounds):
+            round_samples = args.samples // rounds + (1 if round_index < args.samples % rounds else 0)
+            for name, _, fn in cases:
+                per_call[name].extend(sample(fn, loops[name], round_samples))
+
+        results = {}
+        print(f"{'benchmark':<22} {'min (us)':>10} {'median (us)':>12} {'p95 (us)':>10} {'rows/sec':>12}")
+        for name, rows, _ in cases:
+            result = results[name] = summarize(per_call[name], loops[name], rows)
+            print(f"{name:<22} {result['min_us']:>10.1f} {result['median_us']:>12.1f} {result['p95_us']:>10.1f} "
+                  f"{result['rows_per_second']:>12,.0f}")
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'environment': environment(),
+        'config': {'train_rows': args.train_rows, 'trees': args.trees, 'samples': args.samples, 'rounds': args.rounds,
+                   'min_sample_ms': args.min_sample_ms, 'threshold': args.threshold, 'statistic': args.statistic},
+        'results': results,
+    }
+
+    regressions = []
+    mismatch = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatch = config_mismatch(report['config'], baseline)
+    if mismatch:
+        print(f"\n❌ Not comparing against baseline {os.path.relpath(args.baseline)}: it was recorded with different settings")
+        for name, (recorded, current) in mismatch.items():
+            print(f"  --{name.replace('_', '-')}: baseline {recorded}, this run {current}")
+        print("   Rerun with the baseline's settings, or record a new baseline with --save-baseline")
+    elif os.path.exists(args.baseline) and not args.save_baseline:
+        regressions = compare(results, baseline, args.threshold, args.statistic)
+        report['baseline'] = {'path': args.baseline, 'created_at': baseline.get('created_at')}
+        print(f"\n📊 {args.statistic} against baseline {os.path.relpath(args.baseline)} ({baseline.get('created_at')}):")
+        for name, result in results.items():
+            if 'ratio' in result:
+                flag = "❌ regression" if result['regressed'] else "✅"
+                print(f"  {name:<22} {result['baseline_us']:>10.1f} -> {result[args.statistic + '_us']:>10.1f} us "
+                      f"({(result['ratio'] - 1) * 100:+.1f}%) {flag}")
+        if baseline.get('environment') != report['environment']:
+            print("⚠️  The baseline was recorded in a different environment; ratios may not be comparable")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {os.path.relpath(args.output)}")
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline written to {os.path.relpath(args.baseline)}")
+
+    if mismatch:
+        return 2
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Convert the pickled model and scaler into the pickle-free artifact directory
+
+    python export_model_artifact.py [--output models/artifact]
+
+Verifies that the exported artifacts score the test split exactly like the
+pickles before reporting success.
+"""
+import argparse
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from ml.artifacts import load_artifacts, write_model, write_scaler
+from ml.inference_pipeline import InferencePipeline
+
+MODEL_PATH = 'models/lgbm_best_model.pkl'
+SCALER_PATH = 'models/scaler.pkl'
+X_TEST_PATH = 'data/processed/X_test_ml.csv'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default='models/artifact', help='Artifact directory to write')
+    args = parser.parse_args()
+
+    model = joblib.load(MODEL_PATH)
+    scaler = joblib.load(SCALER_PATH)
+    write_scaler(args.output, scaler)
+    write_model(args.output, model)
+
+    booster, scaler_params, manifest = load_artifacts(args.output)
+    X_test = pd.read_csv(X_TEST_PATH).to_numpy(dtype=np.float64)
+    expected = InferencePipeline.build(model, scaler).score(X_test.copy())
+    actual = InferencePipeline.build(booster, scaler_params).score(X_test.copy())
+    max_diff = float(np.max(np.abs(expected - actual)))
+    print(f"Artifact {manifest['artifact_id']} written to {args.output}")
+    for name, entry in manifest['files'].items():
+        print(f"  {name:<14} {entry['bytes']:>9,} bytes  sha256 {entry['sha256'][:16]}…")
+    print(f"Max probability difference vs pickles on {len(X_test)} rows: {max_diff:.3e}")
+    if max_diff > 1e-12:
+        print("❌ Exported artifact does not match the pickled model")
+        return 1
+    print("✅ Exported artifact matches the pickled model")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+GlucoTrack command line tools
+
+    python glucotrack.py score registry.parquet -o predictions.parquet --workers 8
+    python glucotrack.py score patients.csv -o predictions.csv --id-column patient_id
+"""
+import argparse
+import os
+import sys
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+def score(args):
+    if args.engine:
+        os.environ["GLUCOTRACK_INFERENCE_ENGINE"] = args.engine
+    if args.workers > 1:
+        # One scoring thread per process, or the pool oversubscribes the CPUs
+        os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+    import logging
+    from services.bulk_scoring_service import BulkScoringService
+
+    logging.basicConfig(level=logging.WARNING)
+
+    def progress(rows):
+        print(f"\r📈 {rows:,} rows scored", end="", file=sys.stderr, flush=True)
+
+    print(f"🧮 Scoring {args.input} -> {args.output} "
+          f"({args.workers} worker{'s' if args.workers != 1 else ''}, {args.chunk_rows:,} rows per chunk)")
+    report = BulkScoringService.score_file(
+        args.input,
+        args.output,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+        id_column=args.id_column,
+        progress=None if args.quiet else progress
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"✅ {report['rows']:,} rows scored ({report['failed']:,} failed) in {report['seconds']:.2f}s "
+          f"- {report['rows_per_second']:,.0f} rows/sec")
+    return 1 if report["rows"] and report["failed"] == report["rows"] else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="glucotrack", description="GlucoTrack command line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    score_parser = subparsers.add_parser("score", help="Score a CSV/Parquet file offline with the API's model pipeline")
+    score_parser.add_argument("input", help="CSV or Parquet file with one patient per row")
+    score_parser.add_argument("-o", "--output", required=True,
+                              help="Predictions file; .parquet/.pq writes Parquet, anything else CSV")
+    score_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                              help="Scoring processes (default: CPU count; 1 scores in-process)")
+    score_parser.add_argument("--chunk-rows", type=int, default=100_000,
+                              help="Rows read and scored per chunk (default: 100000)")
+    score_parser.add_argument("--id-column",
+                              help="Input column copied to the output next to the row index")
+    score_parser.add_argument("--engine", choices=["lightgbm", "native"],
+                              help="Scoring engine (default: GLUCOTRACK_INFERENCE_ENGINE)")
+    score_parser.add_argument("--quiet", action="store_true", help="Do not print progress")
+    score_parser.set_defaults(func=score)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
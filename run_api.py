@@ -1,27 +1,141 @@
 #!/usr/bin/env python3
 """
 Startup script for GlucoTrack API
+
+    python run_api.py                      # development: one process with auto-reload
+    python run_api.py --prod --workers 4   # production: preloaded model, pre-forked workers
 """
-import sys
+import argparse
+import gc
 import os
+import signal
+import socket
+import sys
+import time
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-if __name__ == "__main__":
-    import uvicorn
-    from src.main import app
-    
+def print_banner(host, port):
     print("🚀 Starting GlucoTrack API...")
     print("📊 Diabetes risk prediction service")
-    print("📖 API Documentation: http://localhost:8000/docs")
-    print("🔍 Health Check: http://localhost:8000/api/v1/health")
-    print("⚡ Ready Check: http://localhost:8000/api/v1/ready")
+    print(f"📖 API Documentation: http://localhost:{port}/docs")
+    print(f"🔍 Health Check: http://localhost:{port}/api/v1/health")
+    print(f"⚡ Ready Check: http://localhost:{port}/api/v1/ready")
+
+def run_dev(host, port):
+    import uvicorn
     
     uvicorn.run(
         "src.main:app", 
-        host="0.0.0.0", 
-        port=8000,
+        host=host, 
+        port=port,
         reload=True,
         log_level="info"
     )
+
+def preload_and_warm_up():
+    """Load the model bundle once in the parent and run warm-up predictions"""
+    from models.health import InputFeatures
+    from repositories.model_repository import ModelRepository
+    from services.prediction_service import PredictionService, prediction_cache
+    
+    pipeline = ModelRepository.get_pipeline()
+    if pipeline is None:
+        raise RuntimeError("Model or scaler could not be loaded - refusing to start workers")
+    
+    sample = InputFeatures(
+        gender="Female", age=45.0, hypertension=0, heart_disease=0,
+        smoking_history="never", bmi=28.5, HbA1c_level=6.2, blood_glucose_level=140.0
+    )
+    start = time.perf_counter()
+    PredictionService.predict_single(sample)
+    pipeline.score(pipeline.transform([sample] * 64))
+    # Warm-up results must not show up as cache hits in the workers
+    prediction_cache.clear()
+    print(f"🔥 Model preloaded and warmed up in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+def run_worker(sock, log_level):
+    """Serve the preloaded app on the inherited listening socket"""
+    import uvicorn
+    from main import app
+    
+    # log_config=None: uvicorn's loggers propagate to the app's queued JSON logging
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on", log_config=None)
+    uvicorn.Server(config).run(sockets=[sock])
+
+def spawn_worker(sock, log_level):
+    pid = os.fork()
+    if pid == 0:
+        # Child: uvicorn installs its own signal handlers
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            run_worker(sock, log_level)
+        finally:
+            os._exit(0)
+    return pid
+
+def run_prod(host, port, workers, log_level):
+    """Pre-fork server: model pages are shared copy-on-write by every worker"""
+    import main  # noqa: F401 - import the app and its dependencies before forking
+    
+    preload_and_warm_up()
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    
+    # Move everything loaded so far out of the collector's reach, so GC passes
+    # in the workers never write to (and thereby copy) the shared model pages
+    gc.collect()
+    gc.freeze()
+    
+    children = {spawn_worker(sock, log_level) for _ in range(workers)}
+    print(f"👷 Started {workers} workers: {sorted(children)}")
+    
+    stopping = False
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️  Worker {pid} exited with status {status}, restarting")
+            children.add(spawn_worker(sock, log_level))
+    sock.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GlucoTrack API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--prod", action="store_true",
+                        help="Preload the model once and fork workers that share it copy-on-write")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes in --prod mode (default: CPU count)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    
+    print_banner(args.host, args.port)
+    if args.prod:
+        run_prod(args.host, args.port, args.workers, args.log_level)
+    else:
+        run_dev(args.host, args.port)
@@ -0,0 +1,195 @@
+import asyncio
+import random
+import re
+import time
+import uuid
+from typing import Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from services import logging_service, profiling_service, telemetry
+from services.profiling_service import ProfileRing, RequestProfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_PATTERN = re.compile(rb"[A-Za-z0-9._:-]{1,128}")
+
+def route_label(scope: Scope) -> str:
+    """The request path with path parameter values put back as ``{name}`` placeholders"""
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+class RequestIdMiddleware:
+    """Binds a request ID to each HTTP request for its log records and returns it as X-Request-ID
+
+    A well-formed incoming ``X-Request-ID`` (up to 128 letters, digits and
+    ``._:-``) is kept, so one ID can follow a request across services;
+    otherwise a random one is generated.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                if REQUEST_ID_PATTERN.fullmatch(value):
+                    request_id = value
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex.encode()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id)]
+            await send(message)
+
+        token = logging_service.bind_request_id(request_id.decode())
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            logging_service.unbind_request_id(token)
+
+class TelemetryMiddleware:
+    """Binds stage timings to each HTTP request and records them when it finishes
+
+    Handlers and services mark stage boundaries with ``telemetry.mark``; the
+    lap from the last mark to the start of the response is recorded as
+    ``serialize``. Only requests that matched a route are recorded, labelled
+    with its template, so arbitrary paths do not create new series. With
+    ``server_timing``, responses of instrumented endpoints also carry their
+    stages in a ``Server-Timing`` header.
+    """
+
+    def __init__(self, app: ASGIApp, record: bool = True, server_timing: bool = True):
+        self.app = app
+        self.record = record
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = telemetry.start_request()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timings.marks:
+                    timings.mark("serialize")
+                    if self.server_timing:
+                        header = timings.server_timing(timings.marks[-1][1]).encode()
+                        message["headers"] = [*message.get("headers", []), (b"server-timing", header)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.record and scope.get("route") is not None:
+                telemetry.observe(route_label(scope), timings, status)
+
+class ProfilingMiddleware:
+    """Profiles selected prediction requests end to end into a ProfileRing
+
+    A request to one of ``paths`` is profiled when it sends ``X-Profile: 1``
+    with a valid ``X-Admin-Token``, or by random sampling at ``sample_rate``.
+    The profile covers dependency resolution, the handler, the work it runs
+    on the inference pool and serialization; its ID is returned in the
+    ``X-Profile-Id`` response header. One request per process is profiled
+    at a time, since cProfile cannot nest (and from Python 3.12 admits one
+    profiler per process): a header-triggered request arriving meanwhile is
+    served unprofiled with an ``X-Profile-Skipped`` header, and no samples
+    are drawn. Requests the
+    loop interleaves show up in a profile, which records how many other
+    requests were in flight. Other requests only pay a counter, a path check
+    and, when sampling, a random draw.
+    """
+
+    def __init__(self, app: ASGIApp, ring: ProfileRing, paths: Tuple[str, ...], sample_rate: float = 0.0):
+        self.app = app
+        self.ring = ring
+        self.paths = paths
+        self.sample_rate = sample_rate
+        self._active: Optional[RequestProfile] = None
+        self._in_flight = 0
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        requested = False
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                requested = value.strip().lower() in (b"1", b"true", b"yes", b"on")
+            elif name == b"x-admin-token":
+                token = value.decode("latin-1")
+        if requested and profiling_service.admin_token_matches(token):
+            return "header"
+        if self.sample_rate > 0 and self._active is None and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Only touched on the event loop thread, so no lock
+        self._in_flight += 1
+        if self._active is not None:
+            self._active.concurrent_requests = max(self._active.concurrent_requests, self._in_flight - 1)
+        try:
+            trigger = self._trigger(scope) if scope["path"].startswith(self.paths) else None
+            if trigger is None:
+                await self.app(scope, receive, send)
+            else:
+                await self._profile(scope, receive, send, trigger)
+        finally:
+            self._in_flight -= 1
+
+    @staticmethod
+    def _skipped(send: Send) -> Send:
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-skipped", b"profiler busy")]
+            await send(message)
+        return send_wrapper
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send, trigger: str) -> None:
+        profile = RequestProfile(profiling_service.new_profile_id())
+        if not profile.start():
+            # Another profile is active: serve the request, never fail it
+            await self.app(scope, receive, self._skipped(send) if trigger == "header" else send)
+            return
+        profile.concurrent_requests = self._in_flight - 1
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile.profile_id.encode())]
+            await send(message)
+
+        self._active = profile
+        token = profiling_service.bind(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            profiling_service.unbind(token)
+            self._active = None
+            try:
+                await asyncio.to_thread(
+                    self.ring.save, profile, scope["method"], scope["path"], status, duration_ms, trigger
+                )
+            except Exception as e:
+                logger.warning(f"Could not save profile {profile.profile_id}: {e}")
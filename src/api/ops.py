@@ -0,0 +1,174 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+from models.meta import ProfilesResponse
+from services import logging_service, profiling_service, telemetry
+from services.profiling_service import profile_ring, SORT_KEYS
+from services.prediction_service import prediction_cache
+from services.inference_executor import inference_executor
+from services.shadow_service import shadow_scorer
+from repositories.model_repository import ModelRepository
+from api.v1.predict import coalescer
+from config import Settings
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics = telemetry.registry
+
+@metrics.gauge("glucotrack_model_info", "Loaded model versions (value is always 1)", ("version", "role"))
+def _model_info():
+    registry = ModelRepository._registry  # no load on scrape
+    if registry is None:
+        return
+    for version in registry.bundles:
+        if version == registry.default_version:
+            role = "default"
+        elif version == registry.shadow_version:
+            role = "shadow"
+        else:
+            role = "routed"
+        yield (version, role), 1
+
+@metrics.gauge("glucotrack_model_traffic_weight", "Relative share of unversioned traffic per model version", ("version",))
+def _model_weights():
+    registry = ModelRepository._registry
+    if registry is not None:
+        for version, weight in registry.weights.items():
+            yield (version,), weight
+
+@metrics.gauge("glucotrack_model_generation", "Reload generation of the published models")
+def _model_generation():
+    registry = ModelRepository._registry
+    yield (), registry.default.generation if registry is not None else 0
+
+@metrics.gauge("glucotrack_model_ready", "1 when a model is loaded and serving")
+def _model_ready():
+    yield (), 1 if ModelRepository._registry is not None else 0
+
+@metrics.gauge("glucotrack_prediction_cache_entries", "Cached predictions")
+def _cache_entries():
+    yield (), prediction_cache.stats().size
+
+@metrics.counter("glucotrack_prediction_cache_lookups_total", "Prediction cache lookups by result", ("result",))
+def _cache_lookups():
+    stats = prediction_cache.stats()
+    yield ("hit",), stats.hits
+    yield ("miss",), stats.misses
+
+@metrics.counter("glucotrack_prediction_cache_removals_total", "Cached predictions dropped, by reason", ("reason",))
+def _cache_removals():
+    stats = prediction_cache.stats()
+    yield ("evicted",), stats.evictions
+    yield ("expired",), stats.expirations
+
+@metrics.gauge("glucotrack_inference_in_flight", "Admitted inference requests (running or queued)")
+def _in_flight():
+    yield (), inference_executor.in_flight
+
+@metrics.gauge("glucotrack_inference_capacity", "Inference requests admitted before shedding")
+def _capacity():
+    yield (), inference_executor.capacity
+
+@metrics.counter("glucotrack_inference_rejected_total", "Inference requests shed with 429/503")
+def _rejected():
+    yield (), inference_executor.rejected
+
+@metrics.gauge("glucotrack_coalescer_pending", "Single predictions waiting for the next micro-batch")
+def _coalescer_pending():
+    yield (), coalescer.stats().pending
+
+@metrics.counter("glucotrack_coalescer_batches_total", "Micro-batches scored")
+def _coalescer_batches():
+    yield (), coalescer.stats().batches
+
+@metrics.counter("glucotrack_coalescer_rows_total", "Single predictions scored in micro-batches")
+def _coalescer_rows():
+    yield (), coalescer.stats().rows
+
+@metrics.gauge("glucotrack_shadow_queue_pending", "Submissions waiting for the shadow model")
+def _shadow_pending():
+    yield (), shadow_scorer.stats().pending
+
+@metrics.counter("glucotrack_shadow_dropped_total", "Shadow submissions dropped because the queue was full")
+def _shadow_dropped():
+    yield (), shadow_scorer.stats().dropped
+
+@metrics.counter("glucotrack_shadow_rows_total", "Rows scored by both a primary and the shadow model", ("primary_version", "shadow_version"))
+def _shadow_rows():
+    for comparison in shadow_scorer.stats().comparisons:
+        yield (comparison.primary_version, comparison.shadow_version), comparison.rows
+
+@metrics.counter(
+    "glucotrack_shadow_risk_disagreements_total",
+    "Rows where the shadow model's risk label differs",
+    ("primary_version", "shadow_version")
+)
+def _shadow_disagreements():
+    for comparison in shadow_scorer.stats().comparisons:
+        yield (comparison.primary_version, comparison.shadow_version), comparison.risk_disagreements
+
+@metrics.counter("glucotrack_log_records_dropped_total", "Log records dropped because the log queue was full")
+def _log_dropped():
+    pipeline = logging_service.pipeline
+    yield (), pipeline.dropped if pipeline is not None else 0
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint
+    
+    - **returns**: Per-stage and per-request latency histograms, cache, queue and shadow
+      gauges and model version labels, in the Prometheus text format
+    """
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+def require_admin(x_admin_token: Optional[str] = Header(None, description="Value of GLUCOTRACK_ADMIN_TOKEN")):
+    """Reject requests without the configured admin token"""
+    if not Settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled - set GLUCOTRACK_ADMIN_TOKEN")
+    if not profiling_service.admin_token_matches(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@router.get("/profiles", response_model=ProfilesResponse, dependencies=[Depends(require_admin)])
+def list_profiles():
+    """
+    Saved request profiles, newest first (Admin endpoint)
+    
+    - **X-Admin-Token**: The configured admin token
+    - **returns**: Sampling rate, ring size and one entry per saved profile
+    """
+    return ProfilesResponse(
+        sample_rate=Settings.PROFILE_SAMPLE_RATE,
+        max_files=profile_ring.max_files,
+        profiles=profile_ring.list()
+    )
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def get_profile(
+    profile_id: str,
+    response_format: Literal["pstats", "text"] = Query(
+        "pstats",
+        alias="format",
+        description="`pstats` downloads the cProfile stats file, `text` returns a report of the top functions"
+    ),
+    sort: Literal[SORT_KEYS] = Query("cumulative", description="Sort order of the text report"),
+    limit: int = Query(50, ge=1, le=1000, description="Functions in the text report")
+):
+    """
+    Fetch a saved request profile (Admin endpoint)
+    
+    - **profile_id**: ID from /ops/profiles or a profiled response's X-Profile-Id header
+    - **format**: `pstats` (default, for `python -m pstats`, snakeviz or flameprof) or `text`
+    - **X-Admin-Token**: The configured admin token
+    """
+    if response_format == "text":
+        report = profile_ring.text(profile_id, sort, limit)
+        if report is None:
+            raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+        return PlainTextResponse(report)
+    path = profile_ring.stats_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
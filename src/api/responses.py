@@ -0,0 +1,82 @@
+import json
+from typing import Any, Callable, Optional
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for prebuilt dicts and lists, rendered with orjson when installed
+
+    Handlers return it directly, which skips FastAPI's response-model
+    validation; the content must already match the documented schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+class UploadStreamingResponse(StreamingResponse):
+    """StreamingResponse for handlers that keep reading the request body while responding
+
+    Starlette's StreamingResponse listens for client disconnects by calling
+    ``receive()`` in a background task on ASGI < 2.4, which would swallow the
+    body chunks the handler is still consuming. On those servers disconnects
+    are detected by ``request.stream()`` itself instead (it raises
+    ``ClientDisconnect``); ASGI >= 2.4 servers get the upstream behaviour.
+
+    ``on_close`` runs exactly once when the response is done, whether the
+    body finished, failed, or never started (the client left first or the
+    response start could not be sent), so resources taken for the stream
+    are always given back.
+    """
+
+    def __init__(self, content: Any, *args: Any, on_close: Optional[Callable[[], None]] = None, **kwargs: Any):
+        super().__init__(content, *args, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            spec_version = tuple(map(int, scope.get("asgi", {}).get("spec_version", "2.0").split(".")))
+            if scope["type"] != "http" or spec_version >= (2, 4):
+                await super().__call__(scope, receive, send)
+                return
+            try:
+                await self.stream_response(send)
+            except OSError:
+                raise ClientDisconnect()
+            if self.background is not None:
+                await self.background()
+        finally:
+            await self._close()
+
+    async def _close(self) -> None:
+        # Stop a body generator that did not run to the end, then release
+        aclose = getattr(self.body_iterator, "aclose", None)
+        try:
+            if aclose is not None:
+                await aclose()
+        finally:
+            on_close, self.on_close = self.on_close, None
+            if on_close is not None:
+                on_close()
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def cached_json_response(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    """Precomputed JSON bytes with validators, or 304 when the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
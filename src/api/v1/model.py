@@ -1,67 +1,119 @@
-from fastapi import APIRouter, HTTPException, Depends
-from models.meta import ModelInfo, ModelMetrics, FeaturesResponse, ReloadResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import Optional
+from models.meta import ModelInfo, ModelMetrics, FeaturesResponse, ReloadStatus, ModelVersionsResponse, ShadowStats
 from services.model_service import ModelService
+from services.shadow_service import shadow_scorer
+from services.metadata_cache import metadata_cache
+from api.responses import cached_json_response
+from config import Settings
 from repositories.model_repository import ModelRepository
+from ml.model_registry import UnknownModelVersionError
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def get_model_loaded():
+async def get_model_loaded():
     """Dependency to ensure model is loaded for info endpoints"""
-    ModelRepository.load_model()  # Attempt to load if not already loaded
+    ModelRepository.get_bundle()  # Loaded at startup; no I/O here
     return True
 
+def metadata_response(request: Request, name: str, version: Optional[str] = None):
+    """Serve a metadata body from the per-version cache, honouring If-None-Match"""
+    entry = metadata_cache.get(name, version)
+    max_age = Settings.METADATA_MAX_AGE_SECONDS
+    cache_control = f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+    return cached_json_response(request, entry.body, entry.etag, cache_control)
+
 @router.get("/model/info", response_model=ModelInfo)
-def get_model_info(_: bool = Depends(get_model_loaded)):
+async def get_model_info(
+    request: Request,
+    version: Optional[str] = Query(None, description="Model version (default: the default version)"),
+    _: bool = Depends(get_model_loaded)
+):
     """
     Get model metadata and information
     
+    - **version**: Optional model version to describe
     - **returns**: Model algorithm, training date, performance metrics, version
     """
     try:
-        return ModelService.get_model_info()
+        return metadata_response(request, "info", version)
+    except UnknownModelVersionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting model info: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving model information")
 
+@router.get("/model/versions", response_model=ModelVersionsResponse)
+def get_model_versions(_: bool = Depends(get_model_loaded)):
+    """
+    List the loaded model versions
+    
+    - **returns**: Default and shadow versions, and each version's traffic weight and load time
+    """
+    versions = ModelService.get_model_versions()
+    if versions is None:
+        raise HTTPException(status_code=503, detail="Model or scaler not loaded - service not ready")
+    return versions
+
+@router.get("/model/shadow", response_model=ShadowStats)
+def get_shadow_stats():
+    """
+    Shadow model comparison statistics
+    
+    - **returns**: Per primary/shadow version pair, rows compared, risk disagreements and probability differences
+    """
+    return shadow_scorer.stats()
+
 @router.get("/model/feature-names", response_model=FeaturesResponse)
 @router.get("/feature-names", response_model=FeaturesResponse)
-def get_feature_names():
+async def get_feature_names(request: Request):
     """
     Get feature names and their specifications
     
     - **returns**: List of features with types, constraints, and allowed values
     """
     try:
-        return ModelService.get_feature_names()
+        return metadata_response(request, "feature-names")
     except Exception as e:
         logger.error(f"Error getting feature names: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving feature information")
 
 @router.get("/model/metrics", response_model=ModelMetrics)
 @router.get("/metrics", response_model=ModelMetrics)
-def get_model_metrics(_: bool = Depends(get_model_loaded)):
+async def get_model_metrics(request: Request, _: bool = Depends(get_model_loaded)):
     """
     Get detailed model performance metrics
     
     - **returns**: Accuracy, precision, recall, F1-score, ROC-AUC, confusion matrix
     """
     try:
-        return ModelService.get_model_metrics()
+        return metadata_response(request, "metrics")
     except Exception as e:
         logger.error(f"Error getting model metrics: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving model metrics")
 
-@router.post("/model/reload", response_model=ReloadResponse)
-def reload_model():
+@router.post("/model/reload", response_model=ReloadStatus, status_code=202)
+async def reload_model():
     """
-    Force reload of model and scaler from disk (Admin endpoint)
+    Reload model, scaler and policy from disk in the background (Admin endpoint)
     
-    - **returns**: Success status and new model version
+    The current model keeps serving until the new one is loaded, warmed up and published.
+    
+    - **returns**: Reload state; poll `GET /model/reload` until `reloading` is false and `generation` has increased
     """
     try:
         return ModelService.reload_model()
     except Exception as e:
         logger.error(f"Error reloading model: {e}")
         raise HTTPException(status_code=500, detail="Error reloading model")
+
+@router.get("/model/reload", response_model=ReloadStatus)
+async def get_reload_status():
+    """
+    Report the progress of a background reload
+    
+    - **returns**: Whether a reload is running, the published generation and the outcome of the last reload
+    """
+    return ModelService.get_reload_status()
@@ -1,13 +1,32 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from typing import Literal, Optional, Union
+from api.responses import FastJSONResponse, UploadStreamingResponse
 from models.health import InputFeatures, PredictionResult
-from models.batch import BatchPredictionRequest, BatchPredictionResponse
-from services.prediction_service import PredictionService
+from models.batch import (
+    BatchPredictionRequest, BatchPredictionResponse, ColumnarBatchPredictionResponse, CoalescerStats, CacheStats
+)
+from services.prediction_service import PredictionService, prediction_cache
+from services.batch_coalescer import PredictionCoalescer
+from services.stream_service import StreamingPredictionService
+from services.columnar_service import ColumnarBatchService, ARROW_STREAM, ARROW_FILE
+from services.inference_executor import inference_executor, InferenceOverloadedError
+from services import profiling_service, telemetry
+from ml.model_registry import UnknownModelVersionError
 from repositories.model_repository import ModelRepository
+from config import Settings
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+coalescer = PredictionCoalescer(
+    max_wait_ms=Settings.COALESCE_MAX_WAIT_MS,
+    max_batch_size=Settings.COALESCE_MAX_BATCH_SIZE
+)
+
 def get_model_ready():
     """Dependency to ensure model is ready before predictions"""
     if not ModelRepository.is_ready():
@@ -17,52 +36,269 @@ def get_model_ready():
         )
     return True
 
+def get_model_version(
+    x_model_version: Optional[str] = Header(
+        None,
+        alias="X-Model-Version",
+        description="Score with this model version instead of the configured traffic split"
+    ),
+    _: bool = Depends(get_model_ready)
+) -> str:
+    """Dependency that routes the request to a model version"""
+    try:
+        return ModelRepository.route(x_model_version).version
+    except UnknownModelVersionError as e:
+        raise unknown_version(e)
+
+def unknown_version(e: UnknownModelVersionError) -> HTTPException:
+    return HTTPException(status_code=404, detail=str(e))
+
+def overloaded(e: InferenceOverloadedError) -> HTTPException:
+    """Translate a shed request into 429/503 with a Retry-After header"""
+    return HTTPException(
+        status_code=e.status_code,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
 @router.post("/predict", response_model=PredictionResult)
-def predict_diabetes(
+async def predict_diabetes(
     features: InputFeatures,
-    _: bool = Depends(get_model_ready)
+    model_version: str = Depends(get_model_version)
 ):
     """
     Predict diabetes risk for a single patient
     
     - **features**: Patient health data including age, BMI, glucose levels, etc.
+    - **X-Model-Version**: Optional header naming the model version to score with
     - **returns**: Risk score (0 or 1) and probability (0-1)
     """
+    # FastAPI has read, decoded and schema-validated the body by now
+    telemetry.mark("parse")
     try:
-        logger.info(f"Received payload: {features}")
-        result = PredictionService.predict_single(features)
-        return result
+        # Patient data: debug level only, rendered by the log listener thread if at all
+        logger.debug("Received payload: %s", features)
+        # Profiled requests are scored on their own, so the profile covers their scoring
+        if Settings.COALESCE_ENABLED and profiling_service.current() is None:
+            # Scored together with other requests arriving in the same window
+            async with inference_executor.admission("predict"):
+                result = await coalescer.predict(features, model_version)
+                telemetry.mark("coalesce")
+                return result
+        return await inference_executor.run("predict", PredictionService.predict_single, features, model_version)
+    except InferenceOverloadedError as e:
+        raise overloaded(e)
+    except UnknownModelVersionError as e:
+        raise unknown_version(e)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during prediction")
 
-@router.post("/batch-predict", response_model=BatchPredictionResponse)
-def batch_predict_diabetes(
-    request: BatchPredictionRequest,
-    _: bool = Depends(get_model_ready)
+BATCH_PREDICT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "oneOf": [
+                        {"$ref": "#/components/schemas/BatchPredictionRequest"},
+                        {
+                            "type": "object",
+                            "required": ["columns"],
+                            "properties": {
+                                "columns": {
+                                    "type": "object",
+                                    "description": "One array per InputFeatures field, all of equal length",
+                                    "additionalProperties": {"type": "array", "items": {}}
+                                }
+                            }
+                        }
+                    ]
+                }
+            },
+            ARROW_STREAM: {"schema": {"type": "string", "format": "binary"}},
+            ARROW_FILE: {"schema": {"type": "string", "format": "binary"}}
+        }
+    }
+}
+
+def check_batch_size(n_rows: int):
+    if not n_rows:
+        raise HTTPException(status_code=422, detail="Empty data list provided")
+    
+    if n_rows > 1000:  # Limit batch size
+        raise HTTPException(
+            status_code=422, 
+            detail="Batch size too large - maximum 1000 patients per request"
+        )
+
+async def predict_columnar(columns, arrow: bool, model_version: str, include_warnings: bool, include_timings: bool = False):
+    try:
+        result, meta = await inference_executor.run(
+            "batch-predict", ColumnarBatchService.predict, columns, model_version, include_warnings
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if arrow:
+        return Response(ColumnarBatchService.to_arrow(result, meta), media_type=ARROW_STREAM)
+    if include_timings:
+        meta["timings"] = telemetry.stage_milliseconds()
+    return FastJSONResponse(ColumnarBatchService.to_json(result, meta))
+
+@router.post(
+    "/batch-predict",
+    response_model=Union[BatchPredictionResponse, ColumnarBatchPredictionResponse],
+    openapi_extra=BATCH_PREDICT_BODY
+)
+async def batch_predict_diabetes(
+    request: Request,
+    response_format: Literal["rows", "compact"] = Query(
+        "rows",
+        alias="format",
+        description="`compact` returns parallel result arrays with the model version stated once"
+    ),
+    include_warnings: bool = Query(
+        False,
+        alias="warnings",
+        description="Add the business rule warnings of /data/validate-batch to every row"
+    ),
+    include_timings: bool = Query(
+        False,
+        alias="timings",
+        description="Add the server-side milliseconds per stage to JSON responses (also in the Server-Timing header)"
+    ),
+    model_version: str = Depends(get_model_version)
 ):
     """
     Predict diabetes risk for multiple patients
     
-    - **request**: List of patient health data
-    - **returns**: List of predictions with processing statistics
+    - **request**: List of patient health data as `{"data": [...]}`, or columns as
+      `{"columns": {...}}` or an Apache Arrow IPC stream
+    - **format**: `rows` (default) or `compact`
+    - **warnings**: `true` adds per-row business rule warnings
+    - **timings**: `true` adds the per-stage timings to JSON responses
+    - **X-Model-Version**: Optional header naming the model version to score with
+    - **returns**: List of predictions with processing statistics; columnar and `compact`
+      requests get columnar results (Arrow requests get an Arrow IPC stream)
     """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
     try:
-        if not request.data:
-            raise HTTPException(status_code=422, detail="Empty data list provided")
+        body = await request.body()
+        if content_type in (ARROW_STREAM, ARROW_FILE):
+            if not ColumnarBatchService.arrow_available():
+                raise HTTPException(status_code=415, detail="Arrow payloads are not supported on this server")
+            try:
+                columns = ColumnarBatchService.read_arrow(body)
+            except Exception as e:
+                raise HTTPException(status_code=422, detail=f"Invalid Arrow payload: {e}")
+            telemetry.mark("parse")
+            check_batch_size(len(next(iter(columns.values()), ())))
+            return await predict_columnar(columns, arrow=True, model_version=model_version, include_warnings=include_warnings)
+        
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise RequestValidationError([{
+                "type": "json_invalid",
+                "loc": ("body",),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": str(e)}
+            }])
+        telemetry.mark("parse")
+        
+        if isinstance(payload, dict) and "columns" in payload:
+            columns = payload["columns"]
+            if not isinstance(columns, dict) or not all(isinstance(v, list) for v in columns.values()):
+                raise HTTPException(status_code=422, detail="columns must be an object of arrays")
+            check_batch_size(len(next(iter(columns.values()), ())))
+            return await predict_columnar(
+                columns, arrow=False, model_version=model_version, include_warnings=include_warnings,
+                include_timings=include_timings
+            )
         
-        if len(request.data) > 1000:  # Limit batch size
-            raise HTTPException(
-                status_code=422, 
-                detail="Batch size too large - maximum 1000 patients per request"
+        try:
+            batch = BatchPredictionRequest.model_validate(payload)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
             )
+        check_batch_size(len(batch.data))
+        telemetry.mark("validate")
         
-        result = PredictionService.predict_batch(request)
-        return result
-    except HTTPException:
+        payload = await inference_executor.run(
+            "batch-predict",
+            PredictionService.predict_batch_payload,
+            batch.data,
+            response_format == "compact",
+            model_version,
+            include_warnings,
+            include_timings
+        )
+        return FastJSONResponse(payload)
+    except InferenceOverloadedError as e:
+        raise overloaded(e)
+    except UnknownModelVersionError as e:
+        raise unknown_version(e)
+    except (HTTPException, RequestValidationError):
         raise
     except Exception as e:
         logger.error(f"Batch prediction error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error during batch prediction")
+
+@router.post("/batch-predict/stream")
+async def stream_batch_predict(
+    request: Request,
+    model_version: str = Depends(get_model_version)
+):
+    """
+    Stream predictions for an NDJSON or CSV upload of any size
+    
+    - **body**: One patient per line, as `application/x-ndjson` or `text/csv` with a header row
+    - **X-Model-Version**: Optional header naming the model version; the whole upload is scored with one version
+    - **returns**: One result per input row, in the same format, written as each chunk is scored
+    """
+    media_type = StreamingPredictionService.media_type(request.headers.get("content-type"))
+    if media_type is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Unsupported content type - send application/x-ndjson or text/csv"
+        )
+    
+    # Admission is checked before the response starts, so overload is still a clean 429/503
+    try:
+        inference_executor.acquire("batch-predict")
+    except InferenceOverloadedError as e:
+        raise overloaded(e)
+    
+    return UploadStreamingResponse(
+        StreamingPredictionService.score_stream(
+            request.stream(),
+            media_type,
+            Settings.STREAM_CHUNK_ROWS,
+            model_version=model_version
+        ),
+        media_type=media_type,
+        # Released when the response is done, even if the body never starts streaming
+        on_close=lambda: inference_executor.release("batch-predict")
+    )
+
+@router.get("/predict/coalescer", response_model=CoalescerStats)
+def get_coalescer_stats():
+    """
+    Micro-batching statistics for /predict
+    
+    - **returns**: Batch fill and queueing delay counters for tuning the coalescing window
+    """
+    return coalescer.stats(enabled=Settings.COALESCE_ENABLED)
+
+@router.get("/predict/cache", response_model=CacheStats)
+def get_cache_stats():
+    """
+    Prediction cache statistics
+    
+    - **returns**: Hit, miss, eviction and expiration counters and current size
+    """
+    return prediction_cache.stats()
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from models.health import InputFeatures, ValidationResult
 from services.validation_service import ValidationService
+from api.responses import FastJSONResponse
+from services import telemetry
 from typing import List
 import logging
 
@@ -41,7 +43,10 @@ def validate_batch_data(features_list: List[InputFeatures]):
                 detail="Batch size too large - maximum 1000 patients per request"
             )
         
-        return ValidationService.validate_batch(features_list)
+        telemetry.mark("parse")
+        payload = ValidationService.validate_batch_payload(features_list)
+        telemetry.mark("validate")
+        return FastJSONResponse(payload)
     except HTTPException:
         raise
     except Exception as e:
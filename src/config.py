@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+class Settings:
+    """Runtime configuration, read once from GLUCOTRACK_* environment variables"""
+    
+    # Scoring engine: "lightgbm" (stock booster) or "native" (numpy tree evaluator)
+    INFERENCE_ENGINE = os.getenv("GLUCOTRACK_INFERENCE_ENGINE", "lightgbm")
+    
+    # Model files: "artifact" (models/artifact, no pickle), "pickle" (*.pkl) or "auto" (artifact if present)
+    MODEL_FORMAT = os.getenv("GLUCOTRACK_MODEL_FORMAT", "auto")
+    
+    # Micro-batching of concurrent /predict calls
+    COALESCE_ENABLED = _env_bool("GLUCOTRACK_COALESCE_ENABLED", False)
+    COALESCE_MAX_WAIT_MS = float(os.getenv("GLUCOTRACK_COALESCE_MAX_WAIT_MS", "2"))
+    COALESCE_MAX_BATCH_SIZE = int(os.getenv("GLUCOTRACK_COALESCE_MAX_BATCH_SIZE", "64"))
+    
+    # In-process LRU/TTL prediction cache (size 0 disables it)
+    PREDICTION_CACHE_SIZE = int(os.getenv("GLUCOTRACK_PREDICTION_CACHE_SIZE", "10000"))
+    PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("GLUCOTRACK_PREDICTION_CACHE_TTL_SECONDS", "300"))
+    
+    # Dedicated inference executor and load shedding
+    INFERENCE_WORKERS = int(os.getenv("GLUCOTRACK_INFERENCE_WORKERS", "0"))  # 0: min(4, CPUs)
+    INFERENCE_QUEUE_SIZE = int(os.getenv("GLUCOTRACK_INFERENCE_QUEUE_SIZE", "64"))
+    PREDICT_CONCURRENCY = int(os.getenv("GLUCOTRACK_PREDICT_CONCURRENCY", "0"))  # 0: no endpoint limit
+    BATCH_PREDICT_CONCURRENCY = int(os.getenv("GLUCOTRACK_BATCH_PREDICT_CONCURRENCY", "4"))
+    RETRY_AFTER_SECONDS = int(os.getenv("GLUCOTRACK_RETRY_AFTER_SECONDS", "1"))
+    
+    # Streaming NDJSON/CSV scoring: rows scored per vectorized call
+    STREAM_CHUNK_ROWS = int(os.getenv("GLUCOTRACK_STREAM_CHUNK_ROWS", "1000"))
+    
+    # Gzip for responses at least this large when the client accepts it (0 disables)
+    GZIP_MIN_SIZE = int(os.getenv("GLUCOTRACK_GZIP_MIN_SIZE", "4096"))
+    GZIP_LEVEL = int(os.getenv("GLUCOTRACK_GZIP_LEVEL", "5"))
+    
+    # Reload automatically when files in models/ change (polling interval in seconds)
+    MODEL_WATCH = _env_bool("GLUCOTRACK_MODEL_WATCH", False)
+    MODEL_WATCH_INTERVAL_SECONDS = float(os.getenv("GLUCOTRACK_MODEL_WATCH_INTERVAL_SECONDS", "2"))
+    
+    # Background retries of a failed startup load (exponential backoff bounds, seconds)
+    MODEL_RETRY_INITIAL_SECONDS = float(os.getenv("GLUCOTRACK_MODEL_RETRY_INITIAL_SECONDS", "1"))
+    MODEL_RETRY_MAX_SECONDS = float(os.getenv("GLUCOTRACK_MODEL_RETRY_MAX_SECONDS", "60"))
+    
+    # Shadow model scoring: submissions queued for the background worker before new ones are dropped
+    SHADOW_QUEUE_SIZE = int(os.getenv("GLUCOTRACK_SHADOW_QUEUE_SIZE", "1000"))
+    
+    # Browser cache lifetime for /model/info, /model/feature-names and /model/metrics (0 = always revalidate)
+    METADATA_MAX_AGE_SECONDS = int(os.getenv("GLUCOTRACK_METADATA_MAX_AGE_SECONDS", "0"))
+    
+    # Per-stage latency histograms (Prometheus text format on /ops/metrics)
+    TELEMETRY_ENABLED = _env_bool("GLUCOTRACK_TELEMETRY_ENABLED", True)
+    # The same stages returned to clients in a Server-Timing response header
+    SERVER_TIMING_ENABLED = _env_bool("GLUCOTRACK_SERVER_TIMING_ENABLED", True)
+    
+    # Logging: level, "json" or "text" lines, per-logger sampling of records below WARNING
+    # ("api.v1.predict=0.01,uvicorn.access=0.1") and records queued before new ones are dropped
+    LOG_LEVEL = os.getenv("GLUCOTRACK_LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("GLUCOTRACK_LOG_FORMAT", "json")
+    LOG_SAMPLE_RATES = os.getenv("GLUCOTRACK_LOG_SAMPLE_RATES", "")
+    LOG_QUEUE_SIZE = int(os.getenv("GLUCOTRACK_LOG_QUEUE_SIZE", "10000"))
+    
+    # Admin endpoints (/ops/profiles) and header-triggered profiling need this token in X-Admin-Token
+    ADMIN_TOKEN = os.getenv("GLUCOTRACK_ADMIN_TOKEN", "")
+    
+    # Per-request profiling of prediction endpoints: sampled fraction, ring directory and size
+    PROFILE_SAMPLE_RATE = float(os.getenv("GLUCOTRACK_PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_DIR = os.getenv("GLUCOTRACK_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "glucotrack-profiles"))
+    PROFILE_MAX_FILES = int(os.getenv("GLUCOTRACK_PROFILE_MAX_FILES", "50"))
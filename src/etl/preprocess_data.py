@@ -3,6 +3,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import joblib
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ml.artifacts import write_scaler
 
 os.makedirs('data/processed', exist_ok=True)
 os.makedirs('models', exist_ok=True)
@@ -31,5 +35,7 @@ X_test.to_csv('data/processed/X_test_ml.csv', index=False)
 y_train.to_csv('data/processed/y_train_ml.csv', index=False)
 y_test.to_csv('data/processed/y_test_ml.csv', index=False)
 joblib.dump(scaler, 'models/scaler.pkl')
+# Pickle-free copy for serving: flat mean/scale array + column names
+write_scaler('models/artifact', scaler)
 
 print("Preprocessed data & scaler saved!")
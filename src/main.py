@@ -1,21 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from api.v1.health import router as health_router
 from api.v1.predict import router as predict_router
 from api.v1.model import router as model_router
 from api.v1.validate import router as validate_router
+from api.ops import router as ops_router
+from api.middleware import ProfilingMiddleware, RequestIdMiddleware, TelemetryMiddleware
+from repositories.model_repository import ModelRepository
+from services.profiling_service import profile_ring
+from services.logging_service import configure_logging
+from config import Settings
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: JSON lines written off the request path by a listener thread
+configure_logging(Settings.LOG_LEVEL, Settings.LOG_FORMAT, Settings.LOG_SAMPLE_RATES, Settings.LOG_QUEUE_SIZE)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model before accepting traffic; a failed load is retried in the background
+    await asyncio.to_thread(ModelRepository.start)
+    if Settings.MODEL_WATCH:
+        ModelRepository.start_watcher(Settings.MODEL_WATCH_INTERVAL_SECONDS)
+    yield
+    ModelRepository.stop()
+
 app = FastAPI(
     title="GlucoTrack API",
     description="Diabetes risk prediction API using machine learning",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -25,13 +44,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+# Compress large responses (batch results) for clients that send Accept-Encoding: gzip
+if Settings.GZIP_MIN_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=Settings.GZIP_MIN_SIZE, compresslevel=Settings.GZIP_LEVEL)
+
+# Per-stage latency telemetry, scraped from /ops/metrics and returned as Server-Timing
+if Settings.TELEMETRY_ENABLED or Settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(
+        TelemetryMiddleware,
+        record=Settings.TELEMETRY_ENABLED,
+        server_timing=Settings.SERVER_TIMING_ENABLED
+    )
+
+# Opt-in per-request profiling of the prediction endpoints, listed on /ops/profiles
+if Settings.ADMIN_TOKEN or Settings.PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        ring=profile_ring,
+        paths=("/api/v1/predict", "/api/v1/batch-predict"),
+        sample_rate=Settings.PROFILE_SAMPLE_RATE
+    )
+
+# Outermost, so every log record of a request carries its ID
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers with v1 prefix
 app.include_router(health_router, prefix="/api/v1", tags=["Health"])
 app.include_router(predict_router, prefix="/api/v1", tags=["Predictions"])
 app.include_router(model_router, prefix="/api/v1", tags=["Model"])
 app.include_router(validate_router, prefix="/api/v1", tags=["Validation"])
+# Operational endpoints stay outside the versioned API
+app.include_router(ops_router, prefix="/ops", tags=["Operations"])
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,130 @@
+"""
+Pickle-free model artifact directory
+
+    manifest.json   format version, creation time, artifact id and a SHA-256 per file
+    model.txt       LightGBM native text model
+    features.json   model column order
+    scaler.npy      float64 array [mean_, scale_] (memory-mappable)
+    scaler.json     scaler column names and with_mean / with_std
+
+``preprocess_data.py`` writes the scaler files and ``train_lgbm.py`` the model
+files; each rewrites the manifest over whatever the directory holds.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.txt"
+FEATURES_FILE = "features.json"
+SCALER_FILE = "scaler.npy"
+SCALER_META_FILE = "scaler.json"
+REQUIRED_FILES = (MODEL_FILE, FEATURES_FILE, SCALER_FILE, SCALER_META_FILE)
+
+@dataclass(frozen=True)
+class ScalerParams:
+    """StandardScaler parameters with the attributes ``InferencePipeline.build`` reads"""
+
+    mean_: np.ndarray
+    scale_: np.ndarray
+    feature_names_in_: Tuple[str, ...]
+    with_mean: bool = True
+    with_std: bool = True
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _write_json(path: str, content: Any) -> None:
+    with open(path, "w") as f:
+        json.dump(content, f, indent=2)
+
+def write_scaler(directory: str, scaler: Any) -> None:
+    """Write a fitted StandardScaler's parameters and refresh the manifest"""
+    os.makedirs(directory, exist_ok=True)
+    n_features = len(scaler.mean_) if scaler.mean_ is not None else len(scaler.scale_)
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+    np.save(os.path.join(directory, SCALER_FILE), np.vstack([mean, scale]).astype(np.float64))
+    _write_json(os.path.join(directory, SCALER_META_FILE), {
+        "features": [str(name) for name in scaler.feature_names_in_],
+        "with_mean": bool(scaler.with_mean),
+        "with_std": bool(scaler.with_std),
+    })
+    write_manifest(directory)
+
+def write_model(directory: str, model: Any) -> None:
+    """Write a trained LightGBM model in native text format and refresh the manifest"""
+    os.makedirs(directory, exist_ok=True)
+    booster = getattr(model, "booster_", model)
+    booster.save_model(os.path.join(directory, MODEL_FILE))
+    _write_json(os.path.join(directory, FEATURES_FILE), list(booster.feature_name()))
+    write_manifest(directory)
+
+def write_manifest(directory: str) -> Dict[str, Any]:
+    """Checksum every artifact file present in ``directory`` into manifest.json"""
+    files = {}
+    for name in REQUIRED_FILES:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            files[name] = {"sha256": _sha256(path), "bytes": os.path.getsize(path)}
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "artifact_id": hashlib.sha256("".join(f["sha256"] for f in files.values()).encode()).hexdigest()[:16],
+        "files": files,
+    }
+    _write_json(os.path.join(directory, MANIFEST_FILE), manifest)
+    return manifest
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    """Read the manifest and check its format version"""
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version: {manifest.get('format_version')}")
+    for name in REQUIRED_FILES:
+        if name not in manifest["files"]:
+            raise ValueError(f"Artifact manifest does not list {name}")
+    return manifest
+
+def _read_verified(directory: str, name: str, manifest: Dict[str, Any]) -> bytes:
+    """File contents, after checking them against the manifest checksum"""
+    with open(os.path.join(directory, name), "rb") as f:
+        content = f.read()
+    if hashlib.sha256(content).hexdigest() != manifest["files"][name]["sha256"]:
+        raise ValueError(f"Checksum mismatch for {name}")
+    return content
+
+def load_artifacts(directory: str) -> Tuple[Any, ScalerParams, Dict[str, Any]]:
+    """Load a verified artifact directory: (LightGBM Booster, scaler parameters, manifest)"""
+    import lightgbm as lgb
+
+    manifest = read_manifest(directory)
+    # Each file is read once: the bytes that were hashed are the bytes that are parsed
+    booster = lgb.Booster(model_str=_read_verified(directory, MODEL_FILE, manifest).decode("utf-8"))
+    feature_names: List[str] = json.loads(_read_verified(directory, FEATURES_FILE, manifest))
+    if list(booster.feature_name()) != feature_names:
+        raise ValueError("Model features do not match features.json")
+
+    _read_verified(directory, SCALER_FILE, manifest)
+    params = np.load(os.path.join(directory, SCALER_FILE), mmap_mode="r", allow_pickle=False)
+    scaler_meta = json.loads(_read_verified(directory, SCALER_META_FILE, manifest))
+    if params.shape != (2, len(scaler_meta["features"])):
+        raise ValueError(f"Scaler parameters have shape {params.shape}, expected (2, {len(scaler_meta['features'])})")
+    scaler = ScalerParams(
+        mean_=params[0],
+        scale_=params[1],
+        feature_names_in_=tuple(scaler_meta["features"]),
+        with_mean=scaler_meta["with_mean"],
+        with_std=scaler_meta["with_std"],
+    )
+    return booster, scaler, manifest
@@ -0,0 +1,92 @@
+import numpy as np
+from typing import Dict, List, Mapping, Optional, Sequence, get_args
+from models.health import InputFeatures
+
+class FeatureEncoder:
+    """Precompiled one-hot encoder mapping InputFeatures onto the model's column order
+
+    Built once per loaded model from ``model.feature_name_``. Every numeric field
+    and every categorical value is resolved to a fixed column index up front, so
+    encoding a request only writes a handful of floats into a numpy row.
+    """
+
+    CATEGORICAL_FIELDS = ('gender', 'smoking_history')
+
+    def __init__(self, feature_names: Sequence[str]):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        self.column_index = {name: i for i, name in enumerate(self.feature_names)}
+        column_index = self.column_index
+
+        # Numeric fields map straight onto a column (or are unused by the model)
+        self.numeric_index: Dict[str, int] = {}
+        for field in InputFeatures.model_fields:
+            if field not in self.CATEGORICAL_FIELDS and field in column_index:
+                self.numeric_index[field] = column_index[field]
+
+        # Categorical values map onto their dummy column; the baseline category
+        # dropped at training time (drop_first=True) maps to None
+        self.category_index: Dict[str, Dict[str, Optional[int]]] = {}
+        for field in self.CATEGORICAL_FIELDS:
+            allowed = get_args(InputFeatures.model_fields[field].annotation)
+            self.category_index[field] = {
+                value: self._resolve_dummy(column_index, field, value) for value in allowed
+            }
+
+        # Flattened lookups used on the hot path
+        self._numeric_fields = list(self.numeric_index.keys())
+        self._numeric_cols = np.array(list(self.numeric_index.values()), dtype=np.intp)
+
+    @staticmethod
+    def _resolve_dummy(column_index: Dict[str, int], field: str, value: str) -> Optional[int]:
+        """Find the dummy column for a categorical value
+
+        LightGBM replaces spaces in feature names with underscores, so
+        ``smoking_history_not current`` is stored as ``smoking_history_not_current``.
+        """
+        name = f"{field}_{value}"
+        if name in column_index:
+            return column_index[name]
+        return column_index.get(name.replace(' ', '_'))
+
+    def encode(self, features: InputFeatures) -> np.ndarray:
+        """Encode a single patient into a (1, n_features) float matrix"""
+        return self.encode_batch([features])
+
+    def encode_batch(self, features_list: List[InputFeatures]) -> np.ndarray:
+        """Encode a list of patients into a (n, n_features) float matrix"""
+        n_rows = len(features_list)
+        X = np.zeros((n_rows, self.n_features), dtype=np.float64)
+
+        # Numeric block: one gather per field, one strided write
+        numeric = np.array(
+            [[getattr(features, field) for field in self._numeric_fields] for features in features_list],
+            dtype=np.float64
+        ).reshape(n_rows, len(self._numeric_fields))
+        X[:, self._numeric_cols] = numeric
+
+        # Categorical block: set the precomputed dummy column for each row
+        for field, mapping in self.category_index.items():
+            for row, features in enumerate(features_list):
+                col = mapping[getattr(features, field)]
+                if col is not None:
+                    X[row, col] = 1.0
+
+        return X
+
+    def encode_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Encode column arrays (one entry per InputFeatures field) into a (n, n_features) matrix
+
+        Used by columnar payloads: no per-row objects are created, every field
+        is written with one vectorized assignment.
+        """
+        n_rows = len(next(iter(columns.values()))) if columns else 0
+        X = np.zeros((n_rows, self.n_features), dtype=np.float64)
+        for field, col in self.numeric_index.items():
+            X[:, col] = np.asarray(columns[field], dtype=np.float64)
+        for field, mapping in self.category_index.items():
+            values = np.asarray(columns[field])
+            for value, col in mapping.items():
+                if col is not None:
+                    X[values == value, col] = 1.0
+        return X
@@ -0,0 +1,123 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Tuple
+from ml.feature_encoder import FeatureEncoder
+from ml.threshold_policy import ThresholdPolicy
+from ml.tree_engine import LightGBMEngine, build_engine
+from models.health import InputFeatures
+
+DEFAULT_NUMERIC_FEATURES = ('age', 'bmi', 'HbA1c_level', 'blood_glucose_level')
+
+@dataclass(frozen=True)
+class InferencePipeline:
+    """Immutable encode -> scale -> score pipeline built once per loaded model
+
+    The scaler's ``mean_``/``scale_`` are expanded to full-width arrays aligned
+    with the model's column order (0 / 1 for columns the scaler does not touch),
+    so scaling an encoded matrix is a single vectorized subtract/divide over
+    1 or N rows.
+    """
+
+    model: Any
+    engine: Any
+    encoder: FeatureEncoder
+    mean: np.ndarray
+    scale: np.ndarray
+    numeric_features: Tuple[str, ...]
+    policy: ThresholdPolicy
+    generation: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        model: Any,
+        scaler: Any,
+        engine: str = LightGBMEngine.name,
+        policy: Optional[ThresholdPolicy] = None,
+        generation: int = 0
+    ) -> "InferencePipeline":
+        """Compile a pipeline from a fitted LightGBM model (or Booster) and StandardScaler
+
+        ``engine`` selects the scorer: ``"lightgbm"`` (stock booster) or
+        ``"native"`` (numpy tree evaluator, see ``ml.tree_engine``).
+        ``policy`` turns probabilities into risk labels (default: 0.5).
+        ``generation`` identifies this build among reloads of the same version.
+        """
+        feature_names = model.feature_name_ if hasattr(model, 'feature_name_') else model.feature_name()
+        encoder = FeatureEncoder(feature_names)
+
+        # Scalers fitted on a DataFrame remember their columns; fall back to
+        # the training-time numeric columns for array-fitted scalers
+        numeric_features = tuple(getattr(scaler, 'feature_names_in_', DEFAULT_NUMERIC_FEATURES))
+
+        mean = np.zeros(encoder.n_features, dtype=np.float64)
+        scale = np.ones(encoder.n_features, dtype=np.float64)
+        n_numeric = len(numeric_features)
+        scaler_mean = scaler.mean_ if getattr(scaler, 'with_mean', True) else np.zeros(n_numeric)
+        scaler_scale = scaler.scale_ if getattr(scaler, 'with_std', True) else np.ones(n_numeric)
+        for i, name in enumerate(numeric_features):
+            if name not in encoder.column_index:
+                raise ValueError(f"Scaler column '{name}' is not a model feature")
+            col = encoder.column_index[name]
+            mean[col] = scaler_mean[i]
+            scale[col] = scaler_scale[i]
+
+        mean.setflags(write=False)
+        scale.setflags(write=False)
+        return cls(
+            model=model,
+            engine=build_engine(model, engine),
+            encoder=encoder,
+            mean=mean,
+            scale=scale,
+            numeric_features=numeric_features,
+            policy=policy or ThresholdPolicy(),
+            generation=generation
+        )
+
+    @property
+    def feature_names(self) -> List[str]:
+        return self.encoder.feature_names
+
+    def transform(self, features_list: List[InputFeatures]) -> np.ndarray:
+        """Encode and scale a list of patients into one model-ready matrix"""
+        X = self.encoder.encode_batch(features_list)
+        return self.scale_in_place(X)
+
+    def transform_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Encode and scale validated feature columns into one model-ready matrix"""
+        X = self.encoder.encode_columns(columns)
+        return self.scale_in_place(X)
+
+    def scale_in_place(self, X: np.ndarray) -> np.ndarray:
+        """Apply the fused StandardScaler step to an encoded matrix"""
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for an already transformed matrix
+
+        Same values as ``model.predict_proba(X)[:, 1]``, without the sklearn
+        wrapper overhead.
+        """
+        return self.engine.score(X)
+
+    def decide(self, probabilities: np.ndarray, features_list: List[InputFeatures]) -> np.ndarray:
+        """Risk labels from one probability pass, using the decision policy"""
+        return self.policy.decide(probabilities, features_list)
+
+    def decide_columns(self, probabilities: np.ndarray, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """Risk labels for columnar input"""
+        return self.policy.decide_columns(
+            probabilities, np.asarray(columns['age'], dtype=np.float64), np.asarray(columns['gender'])
+        )
+
+    def warm_up(self, n_rows: int = 64) -> None:
+        """Run synthetic rows through every stage so the first real request is not a cold one"""
+        columns = {field: np.ones(n_rows) for field in self.encoder.numeric_index}
+        for field, categories in self.encoder.category_index.items():
+            columns[field] = np.full(n_rows, next(iter(categories)), dtype=object)
+        for rows in (1, n_rows):
+            subset = {field: values[:rows] for field, values in columns.items()}
+            self.decide_columns(self.score(self.transform_columns(subset)), subset)
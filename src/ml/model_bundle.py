@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping
+from ml.inference_pipeline import InferencePipeline
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Everything one model version serves with, published as a single reference
+
+    Readers take one reference to the bundle and use its pipeline and metadata
+    together, so a concurrent reload can never pair the new model with the old
+    scaler or version string.
+    """
+
+    pipeline: InferencePipeline
+    model: Any
+    scaler: Any
+    info: Mapping[str, Any]
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'info', MappingProxyType(dict(self.info)))
+
+    @property
+    def version(self) -> str:
+        return self.info["version"]
+
+    @property
+    def generation(self) -> int:
+        return self.pipeline.generation
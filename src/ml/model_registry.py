@@ -0,0 +1,60 @@
+import random
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional, Tuple
+from ml.model_bundle import ModelBundle
+
+class UnknownModelVersionError(LookupError):
+    """Raised when a request names a model version that is not loaded"""
+
+    def __init__(self, version: str):
+        super().__init__(f"Model version '{version}' is not loaded")
+        self.version = version
+
+@dataclass(frozen=True)
+class ModelRegistry:
+    """Immutable set of loaded model bundles with their traffic split
+
+    Requests name a version explicitly or are routed by ``weights`` (relative
+    traffic shares; versions without a weight get no unrouted traffic, and
+    with no weights at all everything goes to ``default_version``). The
+    optional ``shadow_version`` is scored off the hot path for comparison.
+    """
+
+    bundles: Mapping[str, ModelBundle]
+    default_version: str
+    weights: Mapping[str, float] = field(default_factory=dict)
+    shadow_version: Optional[str] = None
+
+    def __post_init__(self):
+        for version in (self.default_version, self.shadow_version, *self.weights):
+            if version is not None and version not in self.bundles:
+                raise ValueError(f"Model version '{version}' is not in the registry")
+        weighted = tuple((v, w) for v, w in self.weights.items() if w > 0)
+        object.__setattr__(self, 'bundles', MappingProxyType(dict(self.bundles)))
+        object.__setattr__(self, 'weights', MappingProxyType(dict(weighted)))
+        object.__setattr__(self, '_routes', tuple(v for v, _ in weighted))
+        object.__setattr__(self, '_cumulative', tuple(accumulate(w for _, w in weighted)))
+
+    @property
+    def default(self) -> ModelBundle:
+        return self.bundles[self.default_version]
+
+    @property
+    def shadow(self) -> Optional[ModelBundle]:
+        return self.bundles[self.shadow_version] if self.shadow_version is not None else None
+
+    def select(self, version: Optional[str] = None, rand: Callable[[], float] = random.random) -> ModelBundle:
+        """The bundle for an explicit version, or one drawn from the weighted split"""
+        if version is not None:
+            bundle = self.bundles.get(version)
+            if bundle is None:
+                raise UnknownModelVersionError(version)
+            return bundle
+        cumulative: Tuple[float, ...] = self._cumulative
+        if not cumulative:
+            return self.default
+        index = bisect_right(cumulative, rand() * cumulative[-1])
+        return self.bundles[self._routes[min(index, len(self._routes) - 1)]]
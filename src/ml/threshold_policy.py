@@ -0,0 +1,59 @@
+import json
+import os
+import numpy as np
+from typing import List, Optional
+from models.health import InputFeatures
+from models.meta import DecisionPolicy
+
+class ThresholdPolicy:
+    """Compiled decision-threshold policy: turns probabilities into risk labels
+
+    A global threshold plus optional cohort overrides (gender and/or an age
+    band); the first matching cohort wins. Cohort bounds are held as arrays so
+    a whole batch is resolved with a few vectorized comparisons.
+    """
+
+    def __init__(self, config: Optional[DecisionPolicy] = None):
+        self.config = config or DecisionPolicy()
+        cohorts = self.config.cohorts
+        self.threshold = self.config.threshold
+        self._genders = [cohort.gender for cohort in cohorts]
+        self._min_age = np.array([-np.inf if c.min_age is None else c.min_age for c in cohorts])
+        self._max_age = np.array([np.inf if c.max_age is None else c.max_age for c in cohorts])
+        self._thresholds = np.array([cohort.threshold for cohort in cohorts])
+
+    @classmethod
+    def load(cls, path: str) -> "ThresholdPolicy":
+        """Load a policy from JSON; a missing file means the default 0.5 policy"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r') as f:
+            return cls(DecisionPolicy(**json.load(f)))
+
+    def thresholds_for(self, features_list: List[InputFeatures]) -> np.ndarray:
+        """Per-row decision thresholds"""
+        if not len(self._thresholds):
+            return np.full(len(features_list), self.threshold)
+        ages = np.array([features.age for features in features_list], dtype=np.float64)
+        genders = np.array([features.gender for features in features_list])
+        return self.thresholds_for_columns(ages, genders)
+
+    def thresholds_for_columns(self, ages: np.ndarray, genders: np.ndarray) -> np.ndarray:
+        """Per-row decision thresholds from age and gender column arrays"""
+        thresholds = np.full(len(ages), self.threshold)
+        unresolved = np.ones(len(ages), dtype=bool)
+        for i, gender in enumerate(self._genders):
+            match = unresolved & (ages >= self._min_age[i]) & (ages < self._max_age[i])
+            if gender is not None:
+                match &= genders == gender
+            thresholds[match] = self._thresholds[i]
+            unresolved &= ~match
+        return thresholds
+
+    def decide(self, probabilities: np.ndarray, features_list: List[InputFeatures]) -> np.ndarray:
+        """Risk labels (0/1) for one probability per row"""
+        return (probabilities >= self.thresholds_for(features_list)).astype(np.int64)
+
+    def decide_columns(self, probabilities: np.ndarray, ages: np.ndarray, genders: np.ndarray) -> np.ndarray:
+        """Risk labels (0/1) from age and gender column arrays"""
+        return (probabilities >= self.thresholds_for_columns(ages, genders)).astype(np.int64)
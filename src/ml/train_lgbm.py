@@ -4,6 +4,10 @@ from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import roc_auc_score
 import joblib
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ml.artifacts import write_model
 
 os.makedirs('models', exist_ok=True)
 
@@ -37,3 +41,7 @@ print("Test ROC-AUC:", roc_auc_score(y_test, y_proba_best))
 
 joblib.dump(best_lgbm, 'models/lgbm_best_model.pkl')
 print("LightGBM best model saved to models/lgbm_best_model.pkl")
+
+# Pickle-free copy for serving: native LightGBM model + feature order + manifest
+write_model('models/artifact', best_lgbm)
+print("LightGBM model artifact saved to models/artifact/")
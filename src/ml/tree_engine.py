@@ -0,0 +1,162 @@
+import numpy as np
+from typing import Any, Dict, List
+
+# LightGBM missing-value handling per split (see Tree::NumericalDecision)
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+_MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+_ZERO_THRESHOLD = 1e-35
+
+class LightGBMEngine:
+    """Stock engine: scores through the trained LightGBM booster"""
+
+    name = "lightgbm"
+
+    def __init__(self, model: Any):
+        self.booster = getattr(model, 'booster_', model)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for a transformed matrix"""
+        return self.booster.predict(X)
+
+class TreeEnsembleEngine:
+    """Native numpy evaluator for an exported LightGBM binary classifier
+
+    All trees are flattened into shared node arrays (split feature, threshold,
+    children, leaf value). Leaves point to themselves, so a whole batch walks
+    every tree at once with ``max_depth`` vectorized steps and no per-row or
+    per-tree Python loop.
+    """
+
+    name = "native"
+
+    def __init__(self, model: Any):
+        booster = getattr(model, 'booster_', model)
+        dump = booster.dump_model()
+        if dump.get("num_tree_per_iteration", 1) != 1:
+            raise ValueError("Native engine only supports binary / single-output models")
+
+        objective = dump.get("objective", "")
+        if not objective.startswith("binary"):
+            raise ValueError(f"Native engine does not support objective '{objective}'")
+        self.sigmoid = 1.0
+        for token in objective.split()[1:]:
+            if token.startswith("sigmoid:"):
+                self.sigmoid = float(token.split(":", 1)[1])
+        self.average_output = bool(dump.get("average_output", False))
+
+        trees = dump["tree_info"]
+        if booster.best_iteration > 0:
+            trees = trees[:booster.best_iteration]
+        self.n_trees = len(trees)
+        self.n_features = dump["max_feature_idx"] + 1
+
+        nodes: Dict[str, List] = {
+            "feature": [], "threshold": [], "left": [], "right": [],
+            "default_left": [], "missing_type": [], "value": []
+        }
+        roots = []
+        self.max_depth = 0
+        for tree in trees:
+            roots.append(len(nodes["feature"]))
+            depth = self._flatten(tree["tree_structure"], nodes)
+            self.max_depth = max(self.max_depth, depth)
+
+        self.roots = np.array(roots, dtype=np.intp)
+        self.feature = np.array(nodes["feature"], dtype=np.intp)
+        self.threshold = np.array(nodes["threshold"], dtype=np.float64)
+        self.left = np.array(nodes["left"], dtype=np.intp)
+        self.right = np.array(nodes["right"], dtype=np.intp)
+        self.default_left = np.array(nodes["default_left"], dtype=bool)
+        self.missing_type = np.array(nodes["missing_type"], dtype=np.int8)
+        self.value = np.array(nodes["value"], dtype=np.float64)
+        self.children = np.stack([self.left, self.right], axis=1).ravel()
+        self._uses_missing = bool(np.any(self.missing_type != MISSING_NONE))
+
+        for array in (self.roots, self.feature, self.threshold, self.left, self.right,
+                      self.children, self.default_left, self.missing_type, self.value):
+            array.setflags(write=False)
+
+    @staticmethod
+    def _flatten(node: Dict[str, Any], nodes: Dict[str, List]) -> int:
+        """Append a tree to the flat node arrays and return its depth"""
+        index = len(nodes["feature"])
+        for key in nodes:
+            nodes[key].append(0)
+
+        if "leaf_value" in node:
+            nodes["feature"][index] = 0
+            nodes["threshold"][index] = 0.0
+            nodes["left"][index] = index
+            nodes["right"][index] = index
+            nodes["default_left"][index] = True
+            nodes["missing_type"][index] = MISSING_NONE
+            nodes["value"][index] = node["leaf_value"]
+            return 0
+
+        if node.get("decision_type", "<=") != "<=":
+            raise ValueError("Native engine does not support categorical splits")
+
+        nodes["feature"][index] = node["split_feature"]
+        nodes["threshold"][index] = node["threshold"]
+        nodes["default_left"][index] = node["default_left"]
+        nodes["missing_type"][index] = _MISSING_TYPES[node["missing_type"]]
+        nodes["value"][index] = 0.0
+        nodes["left"][index] = len(nodes["feature"])
+        left_depth = TreeEnsembleEngine._flatten(node["left_child"], nodes)
+        nodes["right"][index] = len(nodes["feature"])
+        right_depth = TreeEnsembleEngine._flatten(node["right_child"], nodes)
+        return 1 + max(left_depth, right_depth)
+
+    def raw_score(self, X: np.ndarray) -> np.ndarray:
+        """Sum of leaf values over all trees (LightGBM ``raw_score``)"""
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if not self._uses_missing:
+            # Splits without missing handling treat NaN as 0.0
+            X = np.where(np.isnan(X), 0.0, X)
+
+        # Flat row-major view: feature lookups become one 1-D gather per level
+        flat = X.ravel()
+        row_offset = (np.arange(X.shape[0]) * self.n_features)[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            x = flat[row_offset + self.feature[node]]
+            if self._uses_missing:
+                go_right = ~self._decide_with_missing(x, node)
+            else:
+                go_right = x > self.threshold[node]
+            # children holds (left, right) pairs, so the next node is one gather
+            node = self.children[2 * node + go_right]
+
+        raw = self.value[node].sum(axis=1)
+        if self.average_output:
+            raw /= self.n_trees
+        return raw
+
+    def _decide_with_missing(self, x: np.ndarray, node: np.ndarray) -> np.ndarray:
+        missing_type = self.missing_type[node]
+        is_nan = np.isnan(x)
+        x = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, x)
+        is_missing = ((missing_type == MISSING_ZERO) & (np.abs(x) <= _ZERO_THRESHOLD)) | \
+                     ((missing_type == MISSING_NAN) & is_nan)
+        return np.where(is_missing, self.default_left[node], x <= self.threshold[node])
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for a transformed matrix"""
+        return 1.0 / (1.0 + np.exp(-self.sigmoid * self.raw_score(X)))
+
+ENGINES = {
+    LightGBMEngine.name: LightGBMEngine,
+    TreeEnsembleEngine.name: TreeEnsembleEngine,
+}
+
+def build_engine(model: Any, name: str = LightGBMEngine.name):
+    """Build the scoring engine selected by name for a trained model"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown inference engine '{name}', expected one of {sorted(ENGINES)}")
+    return ENGINES[name](model)
@@ -0,0 +1,67 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from models.health import InputFeatures
+
+class BatchPredictionRequest(BaseModel):
+    data: List[InputFeatures] = Field(..., description="List of patient data for batch prediction")
+
+class BatchPredictionResult(BaseModel):
+    risk: Optional[int] = Field(None, description="Diabetes risk: 0 (low) or 1 (high), null if the row failed")
+    probability: Optional[float] = Field(None, ge=0, le=1, description="Probability of diabetes (0-1), null if the row failed")
+    model_version: str = Field(..., description="Model version used for prediction")
+    confidence: Optional[float] = Field(None, ge=0, le=1, description="Model confidence (0-1, optional)")
+    error: Optional[str] = Field(None, description="Reason the row could not be scored")
+    warnings: Optional[List[str]] = Field(None, description="Business rule warnings, when requested with warnings=true")
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[BatchPredictionResult] = Field(..., description="Prediction results for each patient, in request order")
+    processed_count: int = Field(..., description="Number of patients processed")
+    failed_count: int = Field(0, description="Number of failed predictions")
+    processing_time_seconds: float = Field(..., description="Server-side processing time for the batch")
+    batch_id: str = Field(..., description="Unique identifier for this batch")
+    timings: Optional[Dict[str, float]] = Field(
+        None, description="Server-side milliseconds per stage up to building this body, when requested with timings=true"
+    )
+
+class CoalescerStats(BaseModel):
+    enabled: bool = Field(..., description="Whether /predict requests are coalesced")
+    max_wait_ms: float = Field(..., description="Coalescing window in milliseconds")
+    max_batch_size: int = Field(..., description="Rows that trigger an immediate flush")
+    batches: int = Field(..., description="Coalesced batches scored")
+    rows: int = Field(..., description="Requests scored through the coalescer")
+    pending: int = Field(..., description="Requests currently waiting for a batch")
+    avg_batch_size: float = Field(..., description="Mean rows per scored batch")
+    avg_fill_ratio: float = Field(..., description="Mean batch size as a fraction of max_batch_size")
+    avg_queue_delay_ms: float = Field(..., description="Mean time a request waited before scoring")
+    max_queue_delay_ms: float = Field(..., description="Worst time a request waited before scoring")
+
+class CacheStats(BaseModel):
+    enabled: bool = Field(..., description="Whether predictions are cached")
+    size: int = Field(..., description="Cached predictions")
+    max_size: int = Field(..., description="Maximum cached predictions before LRU eviction")
+    ttl_seconds: float = Field(..., description="Time to live of a cached prediction")
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups that had to be scored")
+    evictions: int = Field(..., description="Entries dropped to stay within max_size")
+    expirations: int = Field(..., description="Entries dropped after their TTL")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+
+class PredictionColumns(BaseModel):
+    risk: List[Optional[int]] = Field(..., description="Diabetes risk per row, null if the row failed")
+    probability: List[Optional[float]] = Field(..., description="Probability of diabetes per row, null if the row failed")
+    confidence: List[Optional[float]] = Field(..., description="Model confidence per row, null if the row failed")
+    error: List[Optional[str]] = Field(..., description="Reason a row could not be scored, null if it succeeded")
+    warnings: Optional[List[Optional[List[str]]]] = Field(
+        None, description="Business rule warnings per row when requested with warnings=true, null if the row failed validation"
+    )
+
+class ColumnarBatchPredictionResponse(BaseModel):
+    columns: PredictionColumns = Field(..., description="Prediction results as parallel arrays, in request order")
+    model_version: str = Field(..., description="Model version used for every row")
+    processed_count: int = Field(..., description="Number of patients processed")
+    failed_count: int = Field(0, description="Number of failed predictions")
+    processing_time_seconds: float = Field(..., description="Server-side processing time for the batch")
+    batch_id: str = Field(..., description="Unique identifier for this batch")
+    timings: Optional[Dict[str, float]] = Field(
+        None, description="Server-side milliseconds per stage up to building this body, when requested with timings=true"
+    )
@@ -7,6 +7,7 @@ class HealthStatus(BaseModel):
 
 class ReadinessStatus(BaseModel):
     ready: bool
+    state: Literal["loading", "ready", "failed"] = Field("ready", description="Model loading state")
     model_loaded: bool
     scaler_loaded: bool
     message: Optional[str] = None
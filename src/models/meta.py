@@ -0,0 +1,101 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal
+from datetime import datetime
+
+class CohortThreshold(BaseModel):
+    name: Optional[str] = Field(None, description="Cohort label")
+    gender: Optional[Literal["Male", "Female"]] = Field(None, description="Match only this gender")
+    min_age: Optional[float] = Field(None, ge=0, le=120, description="Inclusive lower age bound")
+    max_age: Optional[float] = Field(None, ge=0, le=120, description="Exclusive upper age bound")
+    threshold: float = Field(..., gt=0, le=1, description="Decision threshold for this cohort")
+
+class DecisionPolicy(BaseModel):
+    threshold: float = Field(0.5, gt=0, le=1, description="Global decision threshold: risk=1 when probability >= threshold")
+    cohorts: List[CohortThreshold] = Field([], description="Per-cohort overrides, first match wins")
+
+class ModelInfo(BaseModel):
+    algorithm: str = Field(..., description="ML algorithm used")
+    trained_at: datetime = Field(..., description="Model training timestamp")
+    roc_auc: float = Field(..., description="ROC AUC score")
+    features: int = Field(..., description="Number of features")
+    version: str = Field(..., description="Model version")
+    model_name: Optional[str] = Field(None, description="Human readable model name")
+    description: Optional[str] = Field(None, description="Short model description")
+    author: Optional[str] = Field(None, description="Model author")
+    training_data: Optional[str] = Field(None, description="Training data description")
+    extra_info: Optional[str] = Field(None, description="Additional model notes")
+    decision_policy: Optional[DecisionPolicy] = Field(None, description="Decision threshold policy loaded with the model")
+
+class ModelMetrics(BaseModel):
+    accuracy: float
+    precision: float
+    recall: float
+    f1_score: float
+    roc_auc: float
+    confusion_matrix: List[List[int]]
+
+class FeatureInfo(BaseModel):
+    name: str
+    type: str
+    required: bool
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    allowed_values: Optional[List[str]] = None
+
+class FeaturesResponse(BaseModel):
+    features: List[FeatureInfo]
+
+class ReloadStatus(BaseModel):
+    message: str
+    reloading: bool = Field(..., description="New model bundles are being loaded and warmed up")
+    generation: int = Field(..., description="Reload generation of the published bundles; increases with every published reload")
+    model_version: Optional[str] = Field(None, description="Default model version being served")
+    last_reload_succeeded: Optional[bool] = Field(None, description="Outcome of the last finished reload, null before the first")
+    last_error: Optional[str] = Field(None, description="Why the last reload failed")
+    last_finished_at: Optional[datetime] = None
+
+class ModelVersionInfo(BaseModel):
+    version: str
+    default: bool = Field(..., description="Serves requests that name no version when no traffic split is set")
+    weight: float = Field(0, description="Relative share of unversioned traffic")
+    shadow: bool = Field(False, description="Scores a copy of primary traffic off the hot path")
+    generation: int = Field(..., description="Reload generation the version was loaded in")
+    loaded_at: datetime
+
+class ModelVersionsResponse(BaseModel):
+    default_version: str
+    shadow_version: Optional[str] = None
+    versions: List[ModelVersionInfo]
+
+class ShadowComparison(BaseModel):
+    primary_version: str
+    shadow_version: str
+    rows: int = Field(..., description="Rows scored by both models")
+    risk_disagreements: int = Field(..., description="Rows where the risk labels differ")
+    disagreement_rate: float
+    mean_abs_probability_diff: float
+    max_abs_probability_diff: float
+
+class ShadowStats(BaseModel):
+    enabled: bool
+    shadow_version: Optional[str] = None
+    pending: int = Field(..., description="Submissions waiting for the shadow worker")
+    dropped: int = Field(..., description="Submissions dropped because the shadow queue was full")
+    errors: int = Field(..., description="Submissions the shadow model failed to score")
+    comparisons: List[ShadowComparison]
+
+class ProfileInfo(BaseModel):
+    id: str
+    created_at: datetime
+    method: str
+    path: str
+    status: int = Field(..., description="Response status code")
+    duration_ms: float = Field(..., description="Wall time from request start to the end of the response")
+    trigger: Literal["header", "sample"] = Field(..., description="X-Profile header or random sampling")
+    concurrent_requests: int = Field(0, description="Most other requests in flight in the worker process while profiling")
+    bytes: int = Field(..., description="Size of the pstats file")
+
+class ProfilesResponse(BaseModel):
+    sample_rate: float = Field(..., description="Fraction of prediction requests profiled without the header")
+    max_files: int = Field(..., description="Profiles kept before the oldest are deleted")
+    profiles: List[ProfileInfo]
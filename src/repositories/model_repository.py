@@ -1,17 +1,59 @@
 import joblib
+import json
 import os
+import threading
+import time
 import pandas as pd
-from typing import Optional, Tuple, Any
+from typing import Optional, Tuple, Any, Callable, List, Mapping
 from datetime import datetime
+from ml.artifacts import MANIFEST_FILE, load_artifacts
+from ml.inference_pipeline import InferencePipeline
+from ml.model_bundle import ModelBundle
+from ml.model_registry import ModelRegistry
+from ml.threshold_policy import ThresholdPolicy
+from repositories.model_watcher import ModelFileWatcher
+from config import Settings
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ModelRepository:
-    """Repository for managing ML model and scaler loading/saving"""
+    """Repository for managing ML model and scaler loading/saving
+
+    Each model version's model, scaler, inference pipeline and metadata live in
+    one immutable ``ModelBundle``; the loaded versions, traffic split and
+    shadow version form an immutable ``ModelRegistry`` (one version unless
+    ``models/registry.json`` lists several). Readers take the current
+    reference without locking; a reload builds and warms up a complete
+    replacement first and then publishes it with a single reference swap, so
+    in-flight requests finish on the old bundles and new ones start on warm
+    new ones.
+    
+    Readiness is an in-memory state (loading -> ready, or failed while a
+    background thread retries with exponential backoff), so the request path
+    never touches the filesystem.
+    """
+    
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
     
-    _model = None
-    _scaler = None
+    _registry: Optional[ModelRegistry] = None
+    _generation = 0
+    _load_lock = threading.RLock()
+    _state = LOADING
+    _last_error: Optional[str] = None
+    _next_retry_at: Optional[float] = None
+    _started = False
+    _retry_stop = threading.Event()
+    _reload_listeners: List[Callable[[], None]] = []
+    _watcher: Optional[ModelFileWatcher] = None
+    _reload_thread: Optional[threading.Thread] = None
+    _reload_start_lock = threading.Lock()
+    _reloading = False
+    _last_reload_succeeded: Optional[bool] = None
+    _last_reload_error: Optional[str] = None
+    _last_reload_at: Optional[datetime] = None
     _model_info = None
     _model_loaded = False
     _scaler_loaded = False
@@ -19,61 +61,230 @@ class ModelRepository:
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     MODEL_PATH = os.path.join(BASE_DIR, "models", "lgbm_best_model.pkl")
     SCALER_PATH = os.path.join(BASE_DIR, "models", "scaler.pkl")
+    POLICY_PATH = os.path.join(BASE_DIR, "models", "threshold_policy.json")
+    ARTIFACT_DIR = os.path.join(BASE_DIR, "models", "artifact")
+    REGISTRY_PATH = os.path.join(BASE_DIR, "models", "registry.json")
     
     @classmethod
-    def load_model(cls) -> Optional[Any]:
-        """Load the trained model from disk"""
-        if cls._model is None:
+    def _registry_config(cls) -> dict:
+        """Model versions to load: models/registry.json, or the single default model"""
+        if not os.path.exists(cls.REGISTRY_PATH):
+            return {"models": [{
+                "version": cls._default_model_info()["version"],
+                "artifact_dir": cls.ARTIFACT_DIR,
+                "model_path": cls.MODEL_PATH,
+                "scaler_path": cls.SCALER_PATH
+            }]}
+        with open(cls.REGISTRY_PATH) as f:
+            config = json.load(f)
+        entries = []
+        for entry in config["models"]:
+            entry = dict(entry)
+            for key in ("artifact_dir", "model_path", "scaler_path", "policy_path"):
+                if key in entry:
+                    entry[key] = os.path.join(cls.BASE_DIR, entry[key])
+            entries.append(entry)
+        return {**config, "models": entries}
+    
+    @classmethod
+    def _use_artifacts(cls, entry: dict) -> bool:
+        if "artifact_dir" not in entry or Settings.MODEL_FORMAT == "pickle":
+            return False
+        if Settings.MODEL_FORMAT == "artifact" or "model_path" not in entry:
+            return True
+        return os.path.exists(os.path.join(entry["artifact_dir"], MANIFEST_FILE))
+    
+    @classmethod
+    def _load_pickles(cls, entry: dict, status: dict) -> Tuple[Any, Any]:
+        model_path, scaler_path = entry["model_path"], entry["scaler_path"]
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        model = joblib.load(model_path)
+        status["model"] = True
+        logger.info(f"Model loaded successfully from {model_path}")
+        
+        if not os.path.exists(scaler_path):
+            raise FileNotFoundError(f"Scaler file not found: {scaler_path}")
+        scaler = joblib.load(scaler_path)
+        status["scaler"] = True
+        logger.info(f"Scaler loaded successfully from {scaler_path}")
+        return model, scaler
+    
+    @classmethod
+    def _load_bundle(cls, entry: dict, generation: int, status: dict) -> ModelBundle:
+        """Load, compile and warm up one model version without publishing it"""
+        if cls._use_artifacts(entry):
+            # Native LightGBM model and flat scaler parameters, verified against the manifest
+            model, scaler, manifest = load_artifacts(entry["artifact_dir"])
+            status["model"] = status["scaler"] = True
+            logger.info(f"Model artifacts {manifest['artifact_id']} loaded from {entry['artifact_dir']}")
+        else:
+            model, scaler = cls._load_pickles(entry, status)
+        
+        start = time.perf_counter()
+        pipeline = InferencePipeline.build(
+            model, scaler, Settings.INFERENCE_ENGINE,
+            ThresholdPolicy.load(entry.get("policy_path", cls.POLICY_PATH)), generation
+        )
+        pipeline.warm_up()
+        logger.info(
+            f"Model {entry['version']}: pipeline built and warmed up with {len(pipeline.feature_names)} features "
+            f"({pipeline.engine.name} engine) in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        info = {**cls._default_model_info(), **entry.get("info", {}), "version": entry["version"]}
+        return ModelBundle(pipeline=pipeline, model=model, scaler=scaler, info=info)
+    
+    @classmethod
+    def _load_registry(cls, status: Optional[dict] = None) -> ModelRegistry:
+        """Load every configured model version into a new, unpublished registry"""
+        status = status if status is not None else {}
+        generation = cls._generation + 1
+        config = cls._registry_config()
+        entries = config["models"]
+        bundles = {entry["version"]: cls._load_bundle(entry, generation, status) for entry in entries}
+        return ModelRegistry(
+            bundles=bundles,
+            default_version=config.get("default", entries[0]["version"]),
+            weights={entry["version"]: float(entry["weight"]) for entry in entries if "weight" in entry},
+            shadow_version=config.get("shadow")
+        )
+    
+    @classmethod
+    def _publish(cls, registry: ModelRegistry) -> None:
+        # A single reference assignment: readers see either the old registry or the new one
+        cls._registry = registry
+        cls._generation = registry.default.generation
+        cls._model_loaded = True
+        cls._scaler_loaded = True
+        cls._last_error = None
+        cls._next_retry_at = None
+        cls._state = cls.READY
+    
+    @classmethod
+    def _attempt_load(cls) -> bool:
+        """One load attempt; updates the readiness state either way"""
+        with cls._load_lock:
+            if cls._registry is not None:
+                return True
+            status = {"model": False, "scaler": False}
             try:
-                if os.path.exists(cls.MODEL_PATH):
-                    cls._model = joblib.load(cls.MODEL_PATH)
-                    cls._model_loaded = True
-                    logger.info(f"Model loaded successfully from {cls.MODEL_PATH}")
-                else:
-                    logger.error(f"Model file not found: {cls.MODEL_PATH}")
-                    cls._model_loaded = False
+                cls._publish(cls._load_registry(status))
             except Exception as e:
-                logger.error(f"Error loading model: {e}")
-                cls._model_loaded = False
-                cls._model = None
-        return cls._model
+                logger.error(f"Error loading model bundle: {e}")
+                cls._model_loaded = status["model"]
+                cls._scaler_loaded = status["scaler"]
+                cls._last_error = str(e)
+                cls._state = cls.FAILED
+                return False
+        logger.info(f"Model versions {', '.join(cls._registry.bundles)} ready (default {cls._registry.default_version})")
+        return True
+    
+    @classmethod
+    def _retry_until_loaded(cls) -> None:
+        delay = Settings.MODEL_RETRY_INITIAL_SECONDS
+        while True:
+            cls._next_retry_at = time.time() + delay
+            if cls._retry_stop.wait(delay):
+                return
+            if cls._attempt_load():
+                cls._next_retry_at = None
+                return
+            delay = min(delay * 2, Settings.MODEL_RETRY_MAX_SECONDS)
+    
+    @classmethod
+    def start(cls) -> bool:
+        """Load the model bundle now (lifespan startup); on failure keep retrying in the background
+
+        Only the first call does any work. Returns whether the bundle is ready.
+        """
+        with cls._load_lock:
+            if cls._started:
+                return cls._state == cls.READY
+            cls._started = True
+            cls._retry_stop.clear()
+            if cls._attempt_load():
+                return True
+        threading.Thread(target=cls._retry_until_loaded, name="model-load-retry", daemon=True).start()
+        return False
+    
+    @classmethod
+    def stop(cls) -> None:
+        """Stop background retries and the file watcher (lifespan shutdown)"""
+        cls._retry_stop.set()
+        cls.stop_watcher()
+        with cls._load_lock:
+            # A later start() (e.g. a restarted app in the same process) tries again
+            cls._started = cls._registry is not None
+    
+    @classmethod
+    def get_registry(cls) -> Optional[ModelRegistry]:
+        """Get the published model registry without any I/O
+
+        Outside the API (scripts, the bulk scorer) the first call performs the
+        startup load.
+        """
+        if not cls._started:
+            cls.start()
+        return cls._registry
+    
+    @classmethod
+    def get_bundle(cls, version: Optional[str] = None) -> Optional[ModelBundle]:
+        """Get the bundle for a model version (default: the default version)
+
+        Raises ``UnknownModelVersionError`` for a version that is not loaded.
+        """
+        registry = cls.get_registry()
+        if registry is None:
+            return None
+        return registry.select(version) if version is not None else registry.default
+    
+    @classmethod
+    def route(cls, version: Optional[str] = None) -> Optional[ModelBundle]:
+        """Pick the bundle for a request: the named version, or one drawn from the traffic split"""
+        registry = cls.get_registry()
+        return registry.select(version) if registry is not None else None
+    
+    @classmethod
+    def load_model(cls) -> Optional[Any]:
+        """Load the trained model from disk"""
+        bundle = cls.get_bundle()
+        return bundle.model if bundle is not None else None
     
     @classmethod
     def load_scaler(cls) -> Optional[Any]:
         """Load the trained scaler from disk"""
-        if cls._scaler is None:
-            try:
-                if os.path.exists(cls.SCALER_PATH):
-                    cls._scaler = joblib.load(cls.SCALER_PATH)
-                    cls._scaler_loaded = True
-                    logger.info(f"Scaler loaded successfully from {cls.SCALER_PATH}")
-                else:
-                    logger.error(f"Scaler file not found: {cls.SCALER_PATH}")
-                    cls._scaler_loaded = False
-            except Exception as e:
-                logger.error(f"Error loading scaler: {e}")
-                cls._scaler_loaded = False
-                cls._scaler = None
-        return cls._scaler
+        bundle = cls.get_bundle()
+        return bundle.scaler if bundle is not None else None
     
     @classmethod
     def get_model_and_scaler(cls) -> Tuple[Optional[Any], Optional[Any]]:
         """Get both model and scaler, loading if necessary"""
-        model = cls.load_model()
-        scaler = cls.load_scaler()
-        return model, scaler
+        bundle = cls.get_bundle()
+        if bundle is None:
+            return None, None
+        return bundle.model, bundle.scaler
+    
+    @classmethod
+    def get_pipeline(cls) -> Optional[InferencePipeline]:
+        """Get the compiled inference pipeline, loading artifacts if necessary"""
+        bundle = cls.get_bundle()
+        return bundle.pipeline if bundle is not None else None
     
     @classmethod
     def is_ready(cls) -> bool:
-        """Check if both model and scaler are loaded"""
-        # Forțează încărcarea la fiecare check
-        cls.load_model()
-        cls.load_scaler()
-        return cls._model_loaded and cls._scaler_loaded
+        """Check if both model and scaler are loaded (in-memory state only)"""
+        return cls.get_bundle() is not None
+    
+    @classmethod
+    def get_model_info(cls, version: Optional[str] = None) -> Mapping[str, Any]:
+        """Get model metadata (default version unless one is named)"""
+        registry = cls._registry
+        if registry is not None:
+            return registry.select(version).info if version is not None else registry.default.info
+        return cls._default_model_info()
     
     @classmethod
-    def get_model_info(cls) -> dict:
-        """Get model metadata"""
+    def _default_model_info(cls) -> dict:
         if cls._model_info is None:
             cls._model_info = {
                 "algorithm": "LightGBM",
@@ -115,29 +326,133 @@ class ModelRepository:
     
     @classmethod
     def reload_model(cls) -> bool:
-        """Force reload of model and scaler from disk"""
-        cls._model = None
-        cls._scaler = None
-        cls._model_loaded = False
-        cls._scaler_loaded = False
-        
-        model = cls.load_model()
-        scaler = cls.load_scaler()
+        """Force reload of model, scaler and decision policy from disk
+
+        The replacement bundle is loaded and warmed up while the current one
+        keeps serving, then published with one reference swap. A failed reload
+        leaves the current bundle in place.
+        """
+        with cls._load_lock:
+            cls._reloading = True
+            try:
+                registry = cls._load_registry()
+            except Exception as e:
+                logger.error(f"Error reloading model: {e}")
+                cls._finish_reload(str(e))
+                return False
+            cls._publish(registry)
+            cls._finish_reload(None)
         
-        return cls.is_ready()
+        logger.info(
+            f"Model versions {', '.join(registry.bundles)} (generation {registry.default.generation}) published"
+        )
+        if cls._watcher is not None:
+            cls._watcher.set_paths(cls._watched_paths())
+        for listener in cls._reload_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Reload listener failed: {e}")
+        return True
+    
+    @classmethod
+    def _finish_reload(cls, error: Optional[str]) -> None:
+        cls._last_reload_succeeded = error is None
+        cls._last_reload_error = error
+        cls._last_reload_at = datetime.now()
+        cls._reloading = False
+    
+    @classmethod
+    def reload_in_background(cls) -> bool:
+        """Reload on a background thread unless a reload is already running
+
+        Requests keep using the current bundle meanwhile. Returns whether a
+        reload was started; ``get_reload_status`` reports its progress.
+        """
+        with cls._reload_start_lock:
+            if cls.is_reloading():
+                return False
+            cls._reload_thread = threading.Thread(target=cls.reload_model, name="model-reload", daemon=True)
+            cls._reload_thread.start()
+        return True
+    
+    @classmethod
+    def is_reloading(cls) -> bool:
+        """Whether a reload (from the API or the file watcher) is in progress"""
+        thread = cls._reload_thread
+        return cls._reloading or (thread is not None and thread.is_alive())
+    
+    @classmethod
+    def get_reload_status(cls) -> dict:
+        """Reload progress and the outcome of the last finished reload, from memory"""
+        registry = cls._registry
+        return {
+            "reloading": cls.is_reloading(),
+            "generation": cls._generation,
+            "model_version": registry.default_version if registry is not None else None,
+            "last_reload_succeeded": cls._last_reload_succeeded,
+            "last_error": cls._last_reload_error,
+            "last_finished_at": cls._last_reload_at
+        }
+    
+    @classmethod
+    def _watched_paths(cls) -> List[str]:
+        """The registry file and the files every configured model version is loaded from"""
+        try:
+            entries = cls._registry_config()["models"]
+        except (OSError, ValueError, KeyError) as e:
+            # An unreadable registry is retried by the next reload; watch the defaults meanwhile
+            logger.warning(f"Could not read the model registry for the watch list: {e}")
+            entries = [{
+                "artifact_dir": cls.ARTIFACT_DIR,
+                "model_path": cls.MODEL_PATH,
+                "scaler_path": cls.SCALER_PATH
+            }]
+        paths = [cls.REGISTRY_PATH]
+        for entry in entries:
+            if "artifact_dir" in entry:
+                paths.append(os.path.join(entry["artifact_dir"], MANIFEST_FILE))
+            paths.extend(entry[key] for key in ("model_path", "scaler_path") if key in entry)
+            paths.append(entry.get("policy_path", cls.POLICY_PATH))
+        return list(dict.fromkeys(paths))
+    
+    @classmethod
+    def start_watcher(cls, interval_seconds: float) -> None:
+        """Reload automatically when a file of a configured model version or the registry changes on disk"""
+        if cls._watcher is not None:
+            return
+        cls._watcher = ModelFileWatcher(cls._watched_paths(), cls.reload_model, interval_seconds)
+        cls._watcher.start()
+        logger.info(f"Watching model artifacts for changes every {interval_seconds}s")
+    
+    @classmethod
+    def stop_watcher(cls) -> None:
+        if cls._watcher is not None:
+            cls._watcher.stop()
+            cls._watcher = None
+    
+    @classmethod
+    def add_reload_listener(cls, listener: Callable[[], None]) -> None:
+        """Register a callback run after a new pipeline is published (e.g. cache invalidation)"""
+        cls._reload_listeners.append(listener)
     
     @classmethod
     def get_readiness_status(cls) -> dict:
         """Get detailed readiness information"""
-        # Try to load if not already loaded
-        if not cls._model_loaded:
-            cls.load_model()
-        if not cls._scaler_loaded:
-            cls.load_scaler()
-            
+        ready = cls.is_ready()
+        state = cls._state
+        if ready:
+            message = "All systems ready"
+        elif state == cls.FAILED:
+            message = f"Model or scaler not loaded: {cls._last_error}"
+            if cls._next_retry_at is not None:
+                message += f" (retrying in {max(0.0, cls._next_retry_at - time.time()):.0f}s)"
+        else:
+            message = "Model and scaler are loading"
         return {
-            "ready": cls.is_ready(),
+            "ready": ready,
+            "state": state,
             "model_loaded": cls._model_loaded,
             "scaler_loaded": cls._scaler_loaded,
-            "message": "All systems ready" if cls.is_ready() else "Model or scaler not loaded"
+            "message": message
         }
\ No newline at end of file
@@ -0,0 +1,74 @@
+import os
+import threading
+from typing import Callable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ModelFileWatcher:
+    """Polls model artifact files and calls ``on_change`` once a change has settled
+
+    A change is only acted on after the files have stayed the same for one
+    more interval, so a model that is still being copied into place is not
+    loaded half-written. ``set_paths`` swaps the watched files, e.g. after a
+    reload changed which ones the models are loaded from.
+    """
+
+    def __init__(self, paths: List[str], on_change: Callable[[], object], interval_seconds: float = 2.0):
+        self.paths = list(paths)
+        self.on_change = on_change
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_paths(self, paths: List[str]) -> None:
+        """Watch ``paths`` from the next poll on, taking their current state as unchanged"""
+        paths = list(paths)
+        if paths != self.paths:
+            self.paths = paths
+
+    @staticmethod
+    def _snapshot(paths: List[str]) -> Tuple[Optional[Tuple[int, int]], ...]:
+        snapshot = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                snapshot.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                snapshot.append(None)
+        return tuple(snapshot)
+
+    def _run(self) -> None:
+        paths = self.paths
+        last = self._snapshot(paths)
+        while not self._stop.wait(self.interval_seconds):
+            if self.paths is not paths:
+                paths = self.paths
+                last = self._snapshot(paths)
+                continue
+            current = self._snapshot(paths)
+            if current == last:
+                continue
+            # Wait for the writes to settle
+            while not self._stop.wait(self.interval_seconds):
+                settled = self._snapshot(paths)
+                if settled == current:
+                    break
+                current = settled
+            else:
+                return
+            last = current
+            logger.info("Model artifacts changed on disk, reloading")
+            try:
+                self.on_change()
+            except Exception as e:
+                logger.error(f"Reload after file change failed: {e}")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds * 2)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from models.health import InputFeatures, PredictionResult
+from models.batch import CoalescerStats
+from services.prediction_service import PredictionService
+from services.inference_executor import inference_executor
+from services import telemetry
+import logging
+
+logger = logging.getLogger(__name__)
+
+class PredictionCoalescer:
+    """Micro-batching front end for concurrent single-patient predictions
+
+    Requests arriving within ``max_wait_ms`` of the first queued request (or
+    until ``max_batch_size`` rows are queued) are scored together with one
+    vectorized ``PredictionService.predict_many`` call. Each caller awaits its
+    own future and gets back its own ``PredictionResult``. Requests routed to
+    different model versions share the flush but are scored per version.
+    Each flush records its own stage timings under the ``coalescer`` endpoint;
+    callers see the whole wait as their ``coalesce`` stage.
+    """
+
+    def __init__(self, max_wait_ms: float = 2.0, max_batch_size: int = 64):
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[InputFeatures, Optional[str], asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks; these keep running flushes alive
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Counters for tuning throughput against tail latency
+        self._batches = 0
+        self._rows = 0
+        self._queue_delay_total = 0.0
+        self._queue_delay_max = 0.0
+
+    async def predict(self, features: InputFeatures, model_version: Optional[str] = None) -> PredictionResult:
+        """Queue one patient and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((features, model_version, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the queued requests to a background scoring task"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[InputFeatures, Optional[str], asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        delays = [started - queued_at for _, _, _, queued_at in batch]
+        self._batches += 1
+        self._rows += len(batch)
+        self._queue_delay_total += sum(delays)
+        self._queue_delay_max = max(self._queue_delay_max, max(delays))
+
+        # The task runs in a copy of the flushing request's context: give the batch its own timings
+        timings = telemetry.start_request()
+        by_version: Dict[Optional[str], List[Tuple[InputFeatures, Optional[str], asyncio.Future, float]]] = {}
+        for entry in batch:
+            by_version.setdefault(entry[1], []).append(entry)
+        try:
+            for model_version, group in by_version.items():
+                await self._score(group, model_version)
+        finally:
+            # A failure or cancellation in one version group must not leave the other callers waiting forever
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Coalesced batch ended before this request was scored"))
+        telemetry.observe("coalescer", timings, 200)
+
+    async def _score(self, group: List[Tuple[InputFeatures, Optional[str], asyncio.Future, float]], model_version: Optional[str]) -> None:
+        features_list = [features for features, _, _, _ in group]
+        try:
+            results = await inference_executor.submit(PredictionService.predict_many, features_list, model_version)
+        except Exception as e:
+            logger.error("Coalesced prediction of %d requests failed: %s", len(group), e)
+            for _, _, future, _ in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future, _), result in zip(group, results):
+            if future.done():  # caller went away
+                continue
+            if result.error is not None:
+                future.set_exception(ValueError(result.error))
+            else:
+                future.set_result(PredictionResult(
+                    risk=result.risk,
+                    probability=result.probability,
+                    model_version=result.model_version,
+                    confidence=result.confidence
+                ))
+
+    def stats(self, enabled: bool = True) -> CoalescerStats:
+        """Batch fill and queueing delay counters since startup"""
+        batches = self._batches or 1
+        rows = self._rows or 1
+        return CoalescerStats(
+            enabled=enabled,
+            max_wait_ms=self.max_wait * 1000.0,
+            max_batch_size=self.max_batch_size,
+            batches=self._batches,
+            rows=self._rows,
+            pending=len(self._pending),
+            avg_batch_size=self._rows / batches,
+            avg_fill_ratio=self._rows / batches / self.max_batch_size,
+            avg_queue_delay_ms=self._queue_delay_total / rows * 1000.0,
+            max_queue_delay_ms=self._queue_delay_max * 1000.0
+        )
@@ -0,0 +1,158 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
+import numpy as np
+import pandas as pd
+from models.health import InputFeatures
+from services.columnar_service import ColumnarBatchService
+from repositories.model_repository import ModelRepository
+import logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet input/output is optional
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = list(InputFeatures.model_fields)
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".parquet", ".pq"):
+        if pa is None:
+            raise RuntimeError("Parquet files require the pyarrow package")
+        return "parquet"
+    return "csv"
+
+def _init_worker() -> None:
+    """Load the model bundle once per worker process"""
+    if ModelRepository.get_pipeline() is None:
+        raise RuntimeError("Model or scaler could not be loaded")
+
+def score_chunk(chunk: pd.DataFrame, first_row: int, id_column: Optional[str] = None) -> pd.DataFrame:
+    """Validate and score one chunk with the API's columnar pipeline"""
+    columns = {name: chunk[name].to_numpy() for name in FEATURE_COLUMNS if name in chunk}
+    result, meta = ColumnarBatchService.predict(columns)
+    valid = result["valid"]
+    scored = pd.DataFrame({
+        "row": np.arange(first_row, first_row + len(chunk)),
+        "risk": pd.array(np.where(valid, result["risk"], 0), dtype="Int8"),
+        "probability": result["probability"],
+        "model_version": meta["model_version"],
+        "confidence": result["confidence"],
+        "error": pd.array(result["error"], dtype="string"),
+    })
+    scored.loc[~valid, "risk"] = pd.NA
+    if id_column is not None:
+        scored.insert(1, id_column, chunk[id_column].to_numpy())
+    return scored
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = _file_format(path)
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, scored: pd.DataFrame) -> None:
+        if self.format == "parquet":
+            table = pa.Table.from_pandas(scored, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+            return
+        scored.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+        self._wrote_header = True
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+class BulkScoringService:
+    """Offline scoring of large CSV/Parquet files
+
+    Input is read in chunks and each chunk is scored with the same encoder,
+    scaler, model and threshold policy as the API (via
+    ``ColumnarBatchService``), either in-process or across a process pool.
+    Chunks are written in input order with at most ``2 * workers`` in flight,
+    so memory stays bounded regardless of file size.
+    """
+
+    @staticmethod
+    def read_chunks(path: str, chunk_rows: int, id_column: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Yield the feature columns (and optional ID column) of an input file in chunks"""
+        usecols = FEATURE_COLUMNS + ([id_column] if id_column else [])
+        if _file_format(path) == "parquet":
+            parquet_file = pq.ParquetFile(path)
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=usecols):
+                yield batch.to_pandas()
+            return
+        yield from pd.read_csv(
+            path,
+            usecols=usecols,
+            chunksize=chunk_rows,
+            dtype={"gender": "object", "smoking_history": "object"},
+            keep_default_na=False,
+            na_values=[""]
+        )
+
+    @staticmethod
+    def score_file(
+        input_path: str,
+        output_path: str,
+        chunk_rows: int = 100_000,
+        workers: int = 1,
+        id_column: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Dict[str, Any]:
+        """Score ``input_path`` into ``output_path``; returns row counts and throughput"""
+        start_time = time.perf_counter()
+        writer = ChunkWriter(output_path)
+        rows = 0
+        failed = 0
+
+        def collect(scored: pd.DataFrame) -> None:
+            nonlocal rows, failed
+            writer.write(scored)
+            rows += len(scored)
+            failed += int(scored["error"].notna().sum())
+            if progress is not None:
+                progress(rows)
+
+        chunks = BulkScoringService.read_chunks(input_path, chunk_rows, id_column)
+        try:
+            if workers <= 1:
+                _init_worker()
+                first_row = 0
+                for chunk in chunks:
+                    collect(score_chunk(chunk, first_row, id_column))
+                    first_row += len(chunk)
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                    pending: "deque[Future]" = deque()
+                    first_row = 0
+                    for chunk in chunks:
+                        pending.append(pool.submit(score_chunk, chunk, first_row, id_column))
+                        first_row += len(chunk)
+                        # Results are written in submission order, so row order is kept
+                        while len(pending) >= 2 * workers:
+                            collect(pending.popleft().result())
+                    while pending:
+                        collect(pending.popleft().result())
+        finally:
+            writer.close()
+
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Scored {rows} rows ({failed} failed) in {elapsed:.2f}s")
+        return {
+            "rows": rows,
+            "failed": failed,
+            "seconds": elapsed,
+            "rows_per_second": rows / elapsed if elapsed > 0 else 0.0,
+        }
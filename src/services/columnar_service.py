@@ -0,0 +1,195 @@
+import time
+import uuid
+import numpy as np
+from typing import Any, Dict, List, Mapping, Optional, Tuple, get_args
+from models.health import InputFeatures
+from services.prediction_service import PredictionService
+from services.validation_service import ValidationService
+from services import telemetry
+import logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Arrow payloads are optional
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+
+class ColumnRule:
+    """Vectorized form of one InputFeatures field's constraints"""
+
+    def __init__(self, name: str, field):
+        self.name = name
+        allowed = get_args(field.annotation)
+        self.allowed: Optional[Tuple[str, ...]] = allowed or None
+        self.integer = field.annotation is int
+        self.ge = next((m.ge for m in field.metadata if hasattr(m, 'ge')), None)
+        self.le = next((m.le for m in field.metadata if hasattr(m, 'le')), None)
+
+RULES = [ColumnRule(name, field) for name, field in InputFeatures.model_fields.items()]
+
+class ColumnarBatchService:
+    """Column-oriented batch scoring (JSON object of arrays or Apache Arrow IPC)
+
+    The ``InputFeatures`` rules are checked per column with vectorized masks and
+    the validated columns go straight into the encoder, so no per-row Pydantic
+    objects are built. Rows that break a rule are reported with an error
+    instead of failing the whole batch.
+    """
+
+    @staticmethod
+    def arrow_available() -> bool:
+        return pa is not None
+
+    @staticmethod
+    def _to_float(values: Any) -> np.ndarray:
+        """Numeric column as float64, NaN where a value is missing or not a number"""
+        try:
+            return np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            out = np.full(len(values), np.nan)
+            for i, value in enumerate(values):
+                try:
+                    out[i] = float(value) if value is not None and not isinstance(value, bool) else np.nan
+                except (TypeError, ValueError):
+                    pass
+            return out
+
+    @staticmethod
+    def validate(columns: Mapping[str, Any]) -> Tuple[Dict[str, np.ndarray], List[Optional[str]]]:
+        """Normalize and check feature columns
+
+        Raises ValueError for structural problems (missing columns, ragged
+        lengths); returns the normalized arrays and one error string (or None)
+        per row.
+        """
+        missing = [rule.name for rule in RULES if rule.name not in columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        lengths = {len(columns[rule.name]) for rule in RULES}
+        if len(lengths) != 1:
+            raise ValueError("All columns must have the same length")
+        n_rows = lengths.pop()
+
+        normalized: Dict[str, np.ndarray] = {}
+        row_errors: Dict[int, List[str]] = {}
+
+        def flag(mask: np.ndarray, message: str) -> None:
+            for index in np.flatnonzero(mask):
+                row_errors.setdefault(int(index), []).append(message)
+
+        for rule in RULES:
+            values = columns[rule.name]
+            if rule.allowed is not None:
+                array = np.asarray(values, dtype=object)
+                flag(~np.isin(array, rule.allowed),
+                     f"{rule.name}: Input should be one of {', '.join(repr(v) for v in rule.allowed)}")
+                normalized[rule.name] = array
+                continue
+
+            array = ColumnarBatchService._to_float(values)
+            finite = np.isfinite(array)
+            flag(~finite, f"{rule.name}: Input should be a valid number")
+            if rule.integer:
+                flag(finite & (array != np.floor(array)), f"{rule.name}: Input should be a valid integer")
+            if rule.ge is not None:
+                flag(finite & (array < rule.ge), f"{rule.name}: Input should be greater than or equal to {rule.ge}")
+            if rule.le is not None:
+                flag(finite & (array > rule.le), f"{rule.name}: Input should be less than or equal to {rule.le}")
+            normalized[rule.name] = array
+
+        errors: List[Optional[str]] = [None] * n_rows
+        for index, messages in row_errors.items():
+            errors[index] = "; ".join(messages)
+        return normalized, errors
+
+    @staticmethod
+    def predict(
+        columns: Mapping[str, Any],
+        model_version: Optional[str] = None,
+        include_warnings: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Validate and score feature columns; returns result columns and batch metadata
+
+        ``include_warnings`` adds the business rule warnings per row, evaluated
+        on the already normalized columns (None for rows that failed validation).
+        """
+        start_time = time.time()
+        normalized, errors = ColumnarBatchService.validate(columns)
+        valid = np.array([error is None for error in errors], dtype=bool)
+        telemetry.mark("validate")
+        probabilities, risks, model_version = PredictionService.predict_columns(normalized, valid, model_version)
+        # Confidence: abs(probability - 0.5) * 2 (distance from uncertainty)
+        confidence = np.abs(probabilities - 0.5) * 2
+
+        failed_count = int((~valid).sum())
+        if failed_count:
+            logger.error("Failed to predict %d of %d patients in columnar batch", failed_count, len(valid))
+        result = {
+            "valid": valid,
+            "risk": risks,
+            "probability": probabilities,
+            "confidence": confidence,
+            "error": errors,
+        }
+        if include_warnings:
+            warnings = ValidationService.warnings_for_columns(normalized)
+            result["warnings"] = [row if ok else None for row, ok in zip(warnings, valid.tolist())]
+            telemetry.mark("validate")
+        meta = {
+            "model_version": model_version,
+            "processed_count": len(valid),
+            "failed_count": failed_count,
+            "processing_time_seconds": time.time() - start_time,
+            "batch_id": str(uuid.uuid4()),
+        }
+        return result, meta
+
+    @staticmethod
+    def to_json(result: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+        """Result columns as a JSON-ready ``ColumnarBatchPredictionResponse`` dict"""
+        valid = result["valid"]
+        if valid.all():
+            columns = {field: result[field].tolist() for field in ("risk", "probability", "confidence")}
+        else:
+            columns = {
+                field: [value if ok else None for value, ok in zip(result[field].tolist(), valid)]
+                for field in ("risk", "probability", "confidence")
+            }
+        columns["error"] = result["error"]
+        if "warnings" in result:
+            columns["warnings"] = result["warnings"]
+        return {"columns": columns, **meta}
+
+    @staticmethod
+    def read_arrow(body: bytes) -> Dict[str, Any]:
+        """Feature columns from an Arrow IPC stream or file"""
+        if pa is None:
+            raise RuntimeError("Arrow payloads require the pyarrow package")
+        try:
+            table = pa.ipc.open_stream(body).read_all()
+        except pa.ArrowInvalid:
+            table = pa.ipc.open_file(body).read_all()
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+
+    @staticmethod
+    def to_arrow(result: Dict[str, Any], meta: Dict[str, Any]) -> bytes:
+        """Result columns as an Arrow IPC stream, batch metadata in the schema"""
+        if pa is None:
+            raise RuntimeError("Arrow payloads require the pyarrow package")
+        invalid = ~result["valid"]
+        table = pa.table({
+            "risk": pa.array(result["risk"], type=pa.int8(), mask=invalid),
+            "probability": pa.array(result["probability"], type=pa.float64(), mask=invalid),
+            "confidence": pa.array(result["confidence"], type=pa.float64(), mask=invalid),
+            "error": pa.array(result["error"], type=pa.string()),
+            **({"warnings": pa.array(result["warnings"], type=pa.list_(pa.string()))} if "warnings" in result else {}),
+        }).replace_schema_metadata({key: str(value) for key, value in meta.items()})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
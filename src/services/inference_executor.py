@@ -0,0 +1,129 @@
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from services import profiling_service, telemetry
+from config import Settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class InferenceOverloadedError(Exception):
+    """Raised when an inference request is shed instead of queued
+
+    ``status_code`` is 429 when an endpoint's own concurrency limit is hit and
+    503 when the shared inference queue is full.
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+def _call(fn: Callable[..., Any], args: tuple) -> Any:
+    telemetry.mark("queue")
+    profile = profiling_service.current()
+    if profile is not None:
+        return profile.runcall(fn, *args)
+    return fn(*args)
+
+class InferenceExecutor:
+    """Dedicated, bounded thread pool for CPU-bound inference
+
+    Inference no longer shares Starlette's default threadpool with /health
+    and /ready. At most ``max_workers + max_queue`` requests are admitted at
+    once and each endpoint can have its own lower limit; anything beyond that
+    is rejected immediately with a Retry-After hint instead of piling up.
+
+    Admission bookkeeping only happens on the event loop thread, so plain
+    counters are enough. Work runs in a copy of the caller's context, so
+    request-scoped state (stage timings, a request profile) follows it onto
+    the pool; the wait for a worker is recorded as the ``queue`` stage.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        endpoint_limits: Optional[Dict[str, int]] = None,
+        retry_after_seconds: int = 1
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.capacity = max_workers + max_queue
+        self.endpoint_limits = {name: limit for name, limit in (endpoint_limits or {}).items() if limit > 0}
+        self.retry_after_seconds = retry_after_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._in_flight = 0
+        self._in_flight_by_endpoint: Dict[str, int] = {}
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, endpoint: str) -> None:
+        """Take a slot for ``endpoint`` or raise InferenceOverloadedError"""
+        limit = self.endpoint_limits.get(endpoint)
+        current = self._in_flight_by_endpoint.get(endpoint, 0)
+        if limit is not None and current >= limit:
+            self.rejected += 1
+            raise InferenceOverloadedError(
+                f"Too many concurrent {endpoint} requests - retry later", 429, self.retry_after_seconds
+            )
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            raise InferenceOverloadedError(
+                "Inference queue is full - retry later", 503, self.retry_after_seconds
+            )
+        self._in_flight += 1
+        self._in_flight_by_endpoint[endpoint] = current + 1
+
+    def release(self, endpoint: str) -> None:
+        """Give back a slot taken with ``acquire``"""
+        self._in_flight -= 1
+        self._in_flight_by_endpoint[endpoint] -= 1
+
+    async def run(self, endpoint: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Admit a request for ``endpoint`` and run ``fn(*args)`` on the inference pool
+
+        The slot is released when the work itself finishes, even if the client
+        disconnects first, so the bound reflects real CPU work.
+        """
+        self.acquire(endpoint)
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._pool.submit(contextvars.copy_context().run, _call, fn, args)
+        except Exception:
+            self.release(endpoint)
+            raise
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self.release, endpoint))
+        return await asyncio.wrap_future(future)
+
+    @asynccontextmanager
+    async def admission(self, endpoint: str) -> AsyncIterator[None]:
+        """Hold a slot for ``endpoint`` around work submitted elsewhere (e.g. the coalescer)"""
+        self.acquire(endpoint)
+        try:
+            yield
+        finally:
+            self.release(endpoint)
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run already-admitted work on the inference pool"""
+        return await asyncio.wrap_future(self._pool.submit(contextvars.copy_context().run, _call, fn, args))
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+inference_executor = InferenceExecutor(
+    max_workers=Settings.INFERENCE_WORKERS or min(4, os.cpu_count() or 1),
+    max_queue=Settings.INFERENCE_QUEUE_SIZE,
+    endpoint_limits={
+        "predict": Settings.PREDICT_CONCURRENCY,
+        "batch-predict": Settings.BATCH_PREDICT_CONCURRENCY,
+    },
+    retry_after_seconds=Settings.RETRY_AFTER_SECONDS
+)
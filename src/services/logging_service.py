@@ -0,0 +1,204 @@
+"""
+Non-blocking, structured logging
+
+Request threads only put log records on a bounded queue: ``prepare`` does
+not format them, so message interpolation and traceback rendering happen
+on the listener thread, and a full queue drops the record (counted) instead
+of stalling the request. Arguments are therefore rendered a little later;
+they must not be mutated after they are logged.
+
+Records carry the ID of the request that produced them (a context
+variable, copied into the inference threads like the stage timings) and
+are written as one JSON object per line, or as plain text. Records below
+WARNING can be sampled per logger with ``GLUCOTRACK_LOG_SAMPLE_RATES``.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+NO_REQUEST_ID = "-"
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+# Attributes every LogRecord has (and uvicorn's ANSI-coloured duplicate
+# message); anything else was passed with extra=
+STANDARD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "color_message"
+}
+
+_request_id: ContextVar[str] = ContextVar("request_id", default=NO_REQUEST_ID)
+
+def bind_request_id(request_id: str) -> Token:
+    return _request_id.set(request_id)
+
+def unbind_request_id(token: Token) -> None:
+    _request_id.reset(token)
+
+def current_request_id() -> str:
+    return _request_id.get()
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """'api.v1.predict=0.01,uvicorn.access=0.1' -> {'api.v1.predict': 0.01, 'uvicorn.access': 0.1}"""
+    rates = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, rate = part.partition("=")
+        try:
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            raise ValueError(f"Invalid log sample rate {part.strip()!r}, expected logger=rate")
+    return rates
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, request ID, extras and exception"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", NO_REQUEST_ID)
+        if request_id != NO_REQUEST_ID:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode("utf-8")
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random share of a logger's records below WARNING
+
+    A rate applies to the named logger and its children; the most specific
+    name wins and loggers without a rate keep everything.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._by_logger: Dict[str, float] = {}
+
+    def _rate_for(self, name: str) -> float:
+        while True:
+            if name in self.rates:
+                return self.rates[name]
+            if "." not in name:
+                return 1.0
+            name = name.rsplit(".", 1)[0]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._by_logger.get(record.name)
+        if rate is None:
+            rate = self._by_logger[record.name] = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queues records unformatted, tagged with the request ID; drops them when the queue is full"""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = _request_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+class LoggingPipeline:
+    """The root logger's queue handler and the listener thread that writes its records"""
+
+    def __init__(self, handler: NonBlockingQueueHandler, output: logging.Handler, queue_size: int):
+        self.handler = handler
+        self.output = output
+        self.queue_size = queue_size
+        self.listener: Optional[QueueListener] = None
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def start(self) -> None:
+        self.listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def restart_after_fork(self) -> None:
+        # The listener thread does not survive fork(), and the old queue's
+        # lock may have been held by it, so the child gets fresh ones
+        self.handler.queue = queue.Queue(maxsize=self.queue_size)
+        self.start()
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener"""
+        if self.listener is None:
+            return
+        try:
+            self.listener.stop()
+        except queue.Full:  # no room for the stop sentinel; the daemon thread dies with the process
+            pass
+        self.listener = None
+
+pipeline: Optional[LoggingPipeline] = None
+
+def _restart_in_child() -> None:
+    if pipeline is not None:
+        pipeline.restart_after_fork()
+
+def configure_logging(
+    level: str = "INFO",
+    log_format: str = "json",
+    sample_rates: str = "",
+    queue_size: int = 10000
+) -> LoggingPipeline:
+    """Route every record through a non-blocking queue to a stderr listener thread"""
+    global pipeline
+    if pipeline is not None:
+        pipeline.stop()
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    rates = parse_sample_rates(sample_rates)
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level.upper())
+
+    if pipeline is None:
+        os.register_at_fork(after_in_child=_restart_in_child)
+        atexit.register(lambda: pipeline is not None and pipeline.stop())
+    pipeline = LoggingPipeline(handler, output, queue_size)
+    pipeline.start()
+    return pipeline
@@ -0,0 +1,59 @@
+import hashlib
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from pydantic import BaseModel
+from services.model_service import ModelService
+from repositories.model_repository import ModelRepository
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+# Endpoint name -> builder taking the model version
+BUILDERS: Dict[str, Callable[[str], BaseModel]] = {
+    "info": ModelService.get_model_info,
+    "feature-names": lambda version: ModelService.get_feature_names(),
+    "metrics": lambda version: ModelService.get_model_metrics(),
+}
+
+class MetadataCache:
+    """Serialized metadata responses with strong ETags, per model version
+
+    Bodies are serialized once per endpoint, model version and pipeline
+    generation, then served as bytes. ``rebuild`` is registered as a
+    ModelRepository reload listener, so a reload regenerates them all.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Optional[str], int], CachedBody] = {}
+
+    @staticmethod
+    def build(name: str, version: Optional[str]) -> CachedBody:
+        body = BUILDERS[name](version).model_dump_json().encode("utf-8")
+        return CachedBody(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+    def get(self, name: str, version: Optional[str] = None) -> CachedBody:
+        """The cached body for an endpoint (default model version unless one is named)"""
+        bundle = ModelRepository.get_bundle(version)
+        key = (name, bundle.version if bundle is not None else None, bundle.generation if bundle is not None else 0)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = MetadataCache.build(name, key[1])
+            self._entries[key] = entry
+        return entry
+
+    def rebuild(self) -> None:
+        """Replace every entry with bodies for the currently published versions"""
+        registry = ModelRepository.get_registry()
+        entries: Dict[Tuple[str, Optional[str], int], CachedBody] = {}
+        if registry is not None:
+            for version, bundle in registry.bundles.items():
+                for name in BUILDERS:
+                    entries[(name, version, bundle.generation)] = MetadataCache.build(name, version)
+        # One reference swap: readers see the old entries or the new ones
+        self._entries = entries
+
+metadata_cache = MetadataCache()
+ModelRepository.add_reload_listener(metadata_cache.rebuild)
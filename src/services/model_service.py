@@ -1,4 +1,7 @@
-from models.meta import ModelInfo, ModelMetrics, FeaturesResponse, FeatureInfo, ReloadResponse
+from typing import Optional
+from models.meta import (
+    ModelInfo, ModelMetrics, FeaturesResponse, FeatureInfo, ReloadStatus, ModelVersionInfo, ModelVersionsResponse
+)
 from repositories.model_repository import ModelRepository
 from datetime import datetime
 import logging
@@ -9,10 +12,34 @@ class ModelService:
     """Service for model metadata and management operations"""
     
     @staticmethod
-    def get_model_info() -> ModelInfo:
-        """Get model information"""
-        info = ModelRepository.get_model_info()
-        return ModelInfo(**info)
+    def get_model_info(version: Optional[str] = None) -> ModelInfo:
+        """Get model information, including the active decision policy"""
+        bundle = ModelRepository.get_bundle(version)
+        if bundle is None:
+            return ModelInfo(**ModelRepository.get_model_info())
+        return ModelInfo(**bundle.info, decision_policy=bundle.pipeline.policy.config)
+    
+    @staticmethod
+    def get_model_versions() -> Optional[ModelVersionsResponse]:
+        """List the loaded model versions with their traffic weights"""
+        registry = ModelRepository.get_registry()
+        if registry is None:
+            return None
+        return ModelVersionsResponse(
+            default_version=registry.default_version,
+            shadow_version=registry.shadow_version,
+            versions=[
+                ModelVersionInfo(
+                    version=version,
+                    default=version == registry.default_version,
+                    weight=registry.weights.get(version, 0),
+                    shadow=version == registry.shadow_version,
+                    generation=bundle.generation,
+                    loaded_at=bundle.loaded_at
+                )
+                for version, bundle in registry.bundles.items()
+            ]
+        )
     
     @staticmethod
     def get_model_metrics() -> ModelMetrics:
@@ -83,25 +110,17 @@ class ModelService:
         return FeaturesResponse(features=features)
     
     @staticmethod
-    def reload_model() -> ReloadResponse:
-        """Reload model and scaler from disk"""
-        try:
-            success = ModelRepository.reload_model()
-            if success:
-                model_info = ModelRepository.get_model_info()
-                return ReloadResponse(
-                    success=True,
-                    message="Model and scaler reloaded successfully",
-                    model_version=model_info["version"]
-                )
-            else:
-                return ReloadResponse(
-                    success=False,
-                    message="Failed to reload model or scaler"
-                )
-        except Exception as e:
-            logger.error(f"Error reloading model: {e}")
-            return ReloadResponse(
-                success=False,
-                message=f"Error reloading model: {str(e)}"
-            )
+    def reload_model() -> ReloadStatus:
+        """Start reloading model, scaler and policy from disk in the background"""
+        if ModelRepository.reload_in_background():
+            message = "Reload started"
+        else:
+            message = "A reload is already in progress"
+        return ReloadStatus(message=message, **ModelRepository.get_reload_status())
+    
+    @staticmethod
+    def get_reload_status() -> ReloadStatus:
+        """Progress of the current reload and the outcome of the last one"""
+        status = ModelRepository.get_reload_status()
+        message = "Reloading" if status["reloading"] else "Idle"
+        return ReloadStatus(message=message, **status)
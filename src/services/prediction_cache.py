@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+from models.health import InputFeatures
+from models.batch import CacheStats
+
+# Field order is fixed by the schema, so value tuples are canonical keys
+_FIELDS = tuple(InputFeatures.model_fields.keys())
+
+CachedPrediction = Tuple[int, float, float]  # risk, probability, confidence
+
+class PredictionCache:
+    """Thread-safe LRU + TTL cache of predictions keyed on canonical inputs
+
+    Keys combine every ``InputFeatures`` value with the model version and the
+    pipeline generation, so entries computed by a replaced model can never be
+    served. ``clear`` is also registered as a ModelRepository reload listener.
+    A ``max_size`` of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedPrediction]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(features: InputFeatures, model_version: str, generation: int) -> Hashable:
+        """Canonical key: model identity plus the input values in schema order"""
+        values = tuple(
+            float(value) if isinstance(value, (int, float)) else value
+            for value in (getattr(features, field) for field in _FIELDS)
+        )
+        return (model_version, generation) + values
+
+    def get(self, key: Hashable) -> Optional[CachedPrediction]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: CachedPrediction) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (called when the model is reloaded)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return CacheStats(
+                enabled=self.enabled,
+                size=len(self._entries),
+                max_size=self.max_size,
+                ttl_seconds=self.ttl_seconds,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                hit_ratio=self.hits / lookups if lookups else 0.0
+            )
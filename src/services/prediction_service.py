@@ -1,102 +1,330 @@
-import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from models.health import InputFeatures, PredictionResult
-from models.batch import BatchPredictionRequest, BatchPredictionResponse
+from models.batch import BatchPredictionRequest, BatchPredictionResponse, BatchPredictionResult
 from repositories.model_repository import ModelRepository
+from ml.inference_pipeline import InferencePipeline
+from ml.model_bundle import ModelBundle
+from ml.model_registry import UnknownModelVersionError
+from services.prediction_cache import PredictionCache
+from services.shadow_service import shadow_scorer
+from services.validation_service import ValidationService
+from services import telemetry
+from config import Settings
+import contextvars
 import logging
 import time
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# (risk, probability, confidence, error) for one scored row
+RowScore = Tuple[Optional[int], Optional[float], Optional[float], Optional[str]]
+
+prediction_cache = PredictionCache(
+    max_size=Settings.PREDICTION_CACHE_SIZE,
+    ttl_seconds=Settings.PREDICTION_CACHE_TTL_SECONDS
+)
+ModelRepository.add_reload_listener(prediction_cache.clear)
+
 class PredictionService:
     """Service for handling diabetes predictions"""
     
     @staticmethod
-    def preprocess_features(features: InputFeatures) -> pd.DataFrame:
-        """Convert input features to DataFrame and preprocess for model"""
-        # Convert input to DataFrame
-        data = features.model_dump()
-        df = pd.DataFrame([data])
-
-        # One-hot encoding pentru gender și smoking_history
-        df = pd.get_dummies(df, columns=['gender', 'smoking_history'])
-
-        # Asigură-te că ai toate coloanele ca la antrenare
-        model, _ = ModelRepository.get_model_and_scaler()
-        expected_cols = model.feature_name_
-        df = df.reindex(columns=expected_cols, fill_value=0)
-
-        return df
+    def preprocess_features(features: InputFeatures) -> np.ndarray:
+        """Encode and scale input features into a single model-ordered row"""
+        return PredictionService.preprocess_batch([features])
+    
+    @staticmethod
+    def preprocess_batch(features_list: List[InputFeatures]) -> np.ndarray:
+        """Encode and scale a list of input features into one model-ordered matrix"""
+        return PredictionService._get_pipeline().transform(features_list)
+    
+    @staticmethod
+    def score_matrix(X: np.ndarray) -> np.ndarray:
+        """Score a preprocessed matrix with a single model call"""
+        return PredictionService._get_pipeline().score(X)
+    
+    @staticmethod
+    def _get_bundle(model_version: Optional[str] = None) -> ModelBundle:
+        bundle = ModelRepository.get_bundle(model_version)
+        if bundle is None:
+            raise ValueError("Model or scaler not loaded")
+        return bundle
+    
+    @staticmethod
+    def _get_pipeline() -> InferencePipeline:
+        return PredictionService._get_bundle().pipeline
     
     @staticmethod
-    def predict_single(features: InputFeatures) -> PredictionResult:
-        """Make a prediction for a single patient"""
+    def predict_single(features: InputFeatures, model_version: Optional[str] = None) -> PredictionResult:
+        """Make a prediction for a single patient (served from the cache on repeats)"""
         try:
-            # Get model and scaler
-            model, scaler = ModelRepository.get_model_and_scaler()
-            
-            if model is None or scaler is None:
-                raise ValueError("Model or scaler not loaded")
-            
-            # Preprocess features
-            df = PredictionService.preprocess_features(features)
+            # Pin one bundle for the whole request so a concurrent reload
+            # cannot mix encoders, models and versions
+            bundle = PredictionService._get_bundle(model_version)
+            pipeline, model_version = bundle.pipeline, bundle.version
+            telemetry.set_model_version(model_version)
+            key = PredictionCache.make_key(features, model_version, pipeline.generation)
+            cached = prediction_cache.get(key)
+            telemetry.mark("cache")
+            if cached is not None:
+                risk, probability, confidence = cached
+                # The shadow model still sees cache-served traffic
+                shadow_scorer.submit_rows(bundle, [features], [risk], [probability])
+                return PredictionResult(
+                    risk=risk,
+                    probability=probability,
+                    model_version=model_version,
+                    confidence=confidence
+                )
             
-            # Scale only numeric columns
-            numeric_cols = ['age', 'bmi', 'HbA1c_level', 'blood_glucose_level']
-            df[numeric_cols] = scaler.transform(df[numeric_cols])
+            X = pipeline.encoder.encode_batch([features])
+            telemetry.mark("encode")
+            pipeline.scale_in_place(X)
+            telemetry.mark("scale")
             
-            # Make prediction
-            prediction = model.predict(df)[0]
-            probability = model.predict_proba(df)[0][1]  # Probability of positive class
+            # One probability pass; risk comes from the decision policy
+            probabilities = pipeline.score(X)
+            telemetry.mark("inference")
+            risk = int(pipeline.decide(probabilities, [features])[0])
+            probability = float(probabilities[0])
             # Confidence: abs(probability - 0.5) * 2 (distance from uncertainty)
             confidence = float(abs(probability - 0.5) * 2)
-            # Get model info for version
-            model_info = ModelRepository.get_model_info()
+            prediction_cache.put(key, (risk, probability, confidence))
+            shadow_scorer.submit_rows(bundle, [features], [risk], [probability])
+            telemetry.mark("decide")
             return PredictionResult(
-                risk=int(prediction),
-                probability=float(probability),
-                model_version=model_info["version"],
+                risk=risk,
+                probability=probability,
+                model_version=model_version,
                 confidence=confidence
             )
+        except UnknownModelVersionError:
+            raise
         except Exception as e:
-            import traceback
-            logger.error(f"Error in prediction: {e}\n{traceback.format_exc()}")
-            raise e
+            # The traceback is rendered by the log listener thread, not here
+            logger.error("Error in prediction: %s", e, exc_info=True)
+            raise
     
     @staticmethod
-    def predict_batch(request: BatchPredictionRequest) -> BatchPredictionResponse:
-        """Make predictions for multiple patients"""
-        # Record start time for processing
-        start_time = time.time()
-        results = []
-        failed_count = 0
-        # Predict for each patient
-        for patient_data in request.data:
+    def score_many(features_list: List[InputFeatures], model_version: Optional[str] = None) -> Tuple[str, List[RowScore]]:
+        """Score many patients in one vectorized pass, reporting failures per row
+
+        Returns the model version and one ``(risk, probability, confidence, error)``
+        tuple per row, so callers can build whichever response shape they need
+        without revalidating the results. Rows already in the prediction cache
+        are served from it; only the misses are encoded and scored.
+        """
+        bundle = PredictionService._get_bundle(model_version)
+        pipeline, model_version = bundle.pipeline, bundle.version
+        telemetry.set_model_version(model_version)
+        n_rows = len(features_list)
+        results: List[Optional[RowScore]] = [None] * n_rows
+
+        keys = [PredictionCache.make_key(features, model_version, pipeline.generation) for features in features_list]
+        misses = []
+        hits = []
+        for index, key in enumerate(keys):
+            cached = prediction_cache.get(key)
+            if cached is None:
+                misses.append(index)
+                continue
+            hits.append(index)
+            results[index] = cached + (None,)
+        if hits:
+            # The shadow model still sees cache-served rows
+            shadow_scorer.submit_rows(
+                bundle,
+                [features_list[index] for index in hits],
+                [results[index][0] for index in hits],
+                [results[index][1] for index in hits]
+            )
+        telemetry.mark("cache")
+        if not misses:
+            return model_version, results
+
+        to_score = [features_list[index] for index in misses]
+        probabilities = np.full(len(misses), np.nan)
+        errors: Dict[int, str] = {}
+        X = pipeline.encoder.encode_batch(to_score)
+        telemetry.mark("encode")
+        pipeline.scale_in_place(X)
+        telemetry.mark("scale")
+
+        # Rows with non-finite values are reported individually instead of
+        # poisoning the whole matrix
+        finite = np.isfinite(X).all(axis=1)
+        for row in np.flatnonzero(~finite):
+            errors[int(row)] = "Non-finite feature values"
+
+        valid = np.flatnonzero(finite)
+        if len(valid):
             try:
-                result = PredictionService.predict_single(patient_data)
-                results.append(result)
+                probabilities[valid] = pipeline.score(X[valid])
             except Exception as e:
-                logger.error(f"Failed to predict for patient: {e}")
-                failed_count += 1
-                # Add a default result for failed predictions
-                model_info = ModelRepository.get_model_info()
-                results.append(PredictionResult(
-                    risk=0,
-                    probability=0.0,
-                    model_version=model_info["version"]
-                ))
+                # Fall back to row-by-row scoring only to isolate the failing rows
+                logger.warning("Vectorized batch scoring failed, isolating rows: %s", e)
+                for row in valid:
+                    try:
+                        probabilities[row] = pipeline.score(X[[row]])[0]
+                    except Exception as row_error:
+                        errors[int(row)] = str(row_error)
+        telemetry.mark("inference")
+
+        if errors:
+            logger.error("Failed to predict %d of %d patients in batch", len(errors), n_rows)
+
+        risks = pipeline.decide(probabilities, to_score).tolist()
+        # Confidence: abs(probability - 0.5) * 2 (distance from uncertainty)
+        confidences = (np.abs(probabilities - 0.5) * 2).tolist()
+        probabilities = probabilities.tolist()
+        shadow_scorer.submit_rows(
+            bundle,
+            to_score,
+            [None if row in errors else risk for row, risk in enumerate(risks)],
+            [None if row in errors else p for row, p in enumerate(probabilities)]
+        )
+        for row, index in enumerate(misses):
+            if row in errors:
+                results[index] = (None, None, None, errors[row])
+                continue
+            scored = (risks[row], probabilities[row], confidences[row])
+            prediction_cache.put(keys[index], scored)
+            results[index] = scored + (None,)
+        telemetry.mark("decide")
+        return model_version, results
+    
+    @staticmethod
+    def predict_many(features_list: List[InputFeatures], model_version: Optional[str] = None) -> List[BatchPredictionResult]:
+        """Score many patients in one vectorized pass, as result models"""
+        model_version, scores = PredictionService.score_many(features_list, model_version)
+        return [
+            BatchPredictionResult(
+                risk=risk,
+                probability=probability,
+                model_version=model_version,
+                confidence=confidence,
+                error=error
+            )
+            for risk, probability, confidence, error in scores
+        ]
+    
+    @staticmethod
+    def predict_columns(
+        columns: Dict[str, np.ndarray],
+        valid: np.ndarray,
+        model_version: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray, str]:
+        """Score validated feature columns in one vectorized pass, without per-row objects
+
+        Rows where ``valid`` is False are skipped. Returns probabilities (NaN
+        for skipped rows), risk labels (-1 for skipped rows) and the model
+        version that scored them. Columnar
+        batches bypass the prediction cache: scoring the whole matrix is
+        cheaper than a per-row key lookup.
+        """
+        bundle = PredictionService._get_bundle(model_version)
+        pipeline = bundle.pipeline
+        telemetry.set_model_version(bundle.version)
+        n_rows = len(valid)
+        probabilities = np.full(n_rows, np.nan)
+        risks = np.full(n_rows, -1, dtype=np.int64)
+        if not valid.any():
+            return probabilities, risks, bundle.version
+
+        subset = {field: values[valid] for field, values in columns.items()}
+        X = pipeline.encoder.encode_columns(subset)
+        telemetry.mark("encode")
+        pipeline.scale_in_place(X)
+        telemetry.mark("scale")
+        scored = pipeline.score(X)
+        telemetry.mark("inference")
+        probabilities[valid] = scored
+        risks[valid] = pipeline.decide_columns(scored, subset)
+        shadow_scorer.submit_columns(bundle, subset, risks[valid], scored)
+        telemetry.mark("decide")
+        return probabilities, risks, bundle.version
+    
+    @staticmethod
+    def predict_batch(
+        request: BatchPredictionRequest,
+        model_version: Optional[str] = None,
+        include_timings: bool = False
+    ) -> BatchPredictionResponse:
+        """Make predictions for multiple patients in one vectorized pass"""
+        if include_timings and telemetry.current() is None:
+            # Called outside a request: time this call on its own
+            def timed() -> BatchPredictionResponse:
+                telemetry.start_request()
+                return PredictionService.predict_batch(request, model_version, include_timings)
+            return contextvars.copy_context().run(timed)
+        return BatchPredictionResponse(**PredictionService.predict_batch_payload(
+            request.data, model_version=model_version, include_timings=include_timings
+        ))
+    
+    @staticmethod
+    def predict_batch_payload(
+        features_list: List[InputFeatures],
+        compact: bool = False,
+        model_version: Optional[str] = None,
+        include_warnings: bool = False,
+        include_timings: bool = False
+    ) -> Dict[str, Any]:
+        """Batch predictions as a JSON-ready dict, skipping per-row model construction
+
+        The layout matches ``BatchPredictionResponse``, or
+        ``ColumnarBatchPredictionResponse`` (parallel arrays, model version
+        stated once) when ``compact`` is set. ``include_warnings`` adds the
+        business rule warnings of ``ValidationService`` per row and
+        ``include_timings`` the request's stage timings so far.
+        """
+        # Record start time for processing
+        start_time = time.time()
+        model_version, scores = PredictionService.score_many(features_list, model_version)
+        failed_count = sum(1 for score in scores if score[3] is not None)
+        warnings = ValidationService.warnings_for(features_list) if include_warnings else None
+        if include_warnings:
+            telemetry.mark("validate")
+        if compact:
+            risks, probabilities, confidences, errors = [list(column) for column in zip(*scores)] or [[], [], [], []]
+            body: Dict[str, Any] = {
+                "columns": {
+                    "risk": risks,
+                    "probability": probabilities,
+                    "confidence": confidences,
+                    "error": errors
+                },
+                "model_version": model_version
+            }
+            if warnings is not None:
+                body["columns"]["warnings"] = warnings
+        else:
+            body = {
+                "predictions": [
+                    {
+                        "risk": risk,
+                        "probability": probability,
+                        "model_version": model_version,
+                        "confidence": confidence,
+                        "error": error
+                    }
+                    for risk, probability, confidence, error in scores
+                ]
+            }
+            if warnings is not None:
+                for prediction, row_warnings in zip(body["predictions"], warnings):
+                    prediction["warnings"] = row_warnings
         # Compute processing time and assign batch ID
-        processing_time_seconds = time.time() - start_time
-        batch_id = str(uuid.uuid4())
-        return BatchPredictionResponse(
-            predictions=results,
-            processing_time_seconds=processing_time_seconds,
-            batch_id=batch_id,
-            processed_count=len(request.data),
-            failed_count=failed_count
+        body.update(
+            processed_count=len(scores),
+            failed_count=failed_count,
+            processing_time_seconds=time.time() - start_time,
+            batch_id=str(uuid.uuid4())
         )
+        if include_timings:
+            body["timings"] = telemetry.stage_milliseconds()
+        return body
     
     @staticmethod
     def is_ready() -> bool:
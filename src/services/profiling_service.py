@@ -0,0 +1,190 @@
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional
+from models.meta import ProfileInfo
+from config import Settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{13}-[0-9]+-[0-9a-f]{8}$")
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+# Before Python 3.12 cProfile only hooks the thread that enabled it. From
+# 3.12 on it registers with sys.monitoring, which sees every thread and
+# admits a single profiler per process: enabling a second one raises.
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+# Held while a request profile is active, in whichever thread started it
+_active_guard = threading.Lock()
+
+class RequestProfile:
+    """cProfile data of one request, across the event loop and the inference pool
+
+    Before Python 3.12 cProfile only sees the thread that enabled it, so
+    work the request hands to the inference executor runs under a profiler
+    of its own and the stats are merged when the request finishes; from 3.12
+    the event loop profiler records those threads itself. It also
+    records whatever other requests the loop interleaves while this one
+    awaits; ``concurrent_requests`` is the most other requests the process
+    was handling at once meanwhile.
+    """
+
+    def __init__(self, profile_id: str):
+        self.profile_id = profile_id
+        self.concurrent_requests = 0
+        self._loop_profiler = cProfile.Profile()
+        self._thread_profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> bool:
+        """Start profiling, unless another request profile or profiling tool is active"""
+        if not _active_guard.acquire(blocking=False):
+            return False
+        try:
+            self._loop_profiler.enable()
+        except ValueError:  # e.g. a debugger or coverage holds the sys.monitoring profiler slot
+            _active_guard.release()
+            return False
+        self._started = True
+        return True
+
+    def stop(self) -> None:
+        if self._started:
+            self._loop_profiler.disable()
+            self._started = False
+            _active_guard.release()
+
+    def runcall(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` on the current thread under a profiler that joins this request's stats"""
+        if not PER_THREAD_PROFILERS:
+            # The request's profiler already records this thread
+            return fn(*args)
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._thread_profilers.append(profiler)
+        return profiler.runcall(fn, *args)
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self._loop_profiler)
+        with self._lock:
+            for profiler in self._thread_profilers:
+                stats.add(profiler)
+        return stats
+
+_current: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar("request_profile", default=None)
+
+def bind(profile: RequestProfile) -> contextvars.Token:
+    return _current.set(profile)
+
+def unbind(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+def current() -> Optional[RequestProfile]:
+    """The profile of the request being handled, if it is profiled"""
+    return _current.get()
+
+def new_profile_id() -> str:
+    """Millisecond timestamp first, so IDs sort by age across worker processes"""
+    return f"{int(time.time() * 1000):013d}-{os.getpid()}-{secrets.token_hex(4)}"
+
+def admin_token_matches(token: Optional[str]) -> bool:
+    """True when an admin token is configured and ``token`` equals it"""
+    return bool(Settings.ADMIN_TOKEN) and token is not None and secrets.compare_digest(token, Settings.ADMIN_TOKEN)
+
+class ProfileRing:
+    """Bounded on-disk ring of request profiles
+
+    Each profile is a ``<id>.prof`` file (``pstats`` format, readable with
+    ``python -m pstats``, snakeviz or flameprof) next to a ``<id>.json`` with
+    the request details. Saving beyond ``max_files`` deletes the oldest.
+    Worker processes share the directory.
+    """
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def _ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".prof") and PROFILE_ID_PATTERN.match(name[:-5]))
+
+    def save(
+        self,
+        profile: RequestProfile,
+        method: str,
+        path: str,
+        status: int,
+        duration_ms: float,
+        trigger: str
+    ) -> ProfileInfo:
+        """Write ``profile`` and drop the oldest profiles beyond ``max_files``"""
+        os.makedirs(self.directory, exist_ok=True)
+        profile.stats().dump_stats(self._path(profile.profile_id, "prof"))
+        info = ProfileInfo(
+            id=profile.profile_id,
+            created_at=datetime.now(timezone.utc),
+            method=method,
+            path=path,
+            status=status,
+            duration_ms=round(duration_ms, 3),
+            trigger=trigger,
+            concurrent_requests=profile.concurrent_requests,
+            bytes=os.path.getsize(self._path(profile.profile_id, "prof"))
+        )
+        with open(self._path(profile.profile_id, "json"), "w") as f:
+            f.write(info.model_dump_json())
+
+        ids = self._ids()
+        for profile_id in ids[:max(0, len(ids) - self.max_files)]:
+            for extension in ("prof", "json"):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except FileNotFoundError:  # another worker pruned it first
+                    pass
+        return info
+
+    def list(self) -> List[ProfileInfo]:
+        """Saved profiles, newest first"""
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(self._path(profile_id, "json")) as f:
+                    profiles.append(ProfileInfo(**json.load(f)))
+            except (FileNotFoundError, ValueError):
+                continue
+        return profiles
+
+    def stats_path(self, profile_id: str) -> Optional[str]:
+        """Path of a saved ``.prof`` file, or None for unknown or malformed IDs"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self._path(profile_id, "prof")
+        return path if os.path.exists(path) else None
+
+    def text(self, profile_id: str, sort: str = "cumulative", limit: int = 50) -> Optional[str]:
+        """``pstats`` report of a saved profile: the ``limit`` top functions by ``sort``"""
+        path = self.stats_path(profile_id)
+        if path is None:
+            return None
+        output = io.StringIO()
+        pstats.Stats(path, stream=output).strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+profile_ring = ProfileRing(Settings.PROFILE_DIR, Settings.PROFILE_MAX_FILES)
@@ -0,0 +1,149 @@
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from models.health import InputFeatures
+from models.meta import ShadowComparison, ShadowStats
+from ml.model_bundle import ModelBundle
+from repositories.model_repository import ModelRepository
+from config import Settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ShadowScorer:
+    """Scores primary traffic with the registry's shadow model on a background thread
+
+    The request path only enqueues the inputs and the primary results
+    (``put_nowait``; a full queue drops the submission and counts it), so the
+    shadow model never adds latency to a response. The worker aggregates
+    risk-label disagreements and probability differences per
+    primary/shadow version pair.
+    """
+
+    def __init__(self, max_queue: int = 1000):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._dropped = 0
+        self._errors = 0
+        # (primary, shadow) -> [rows, disagreements, abs diff sum, max abs diff]
+        self._comparisons: Dict[Tuple[str, str], List[float]] = {}
+
+    def _shadow_for(self, primary: ModelBundle) -> Optional[ModelBundle]:
+        registry = ModelRepository.get_registry()
+        shadow = registry.shadow if registry is not None else None
+        if shadow is None or shadow.version == primary.version:
+            return None
+        return shadow
+
+    def _ensure_worker(self) -> None:
+        # Threads do not survive fork(), so pre-forked workers start their own
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+                self._thread.start()
+
+    def _enqueue(self, item: tuple) -> None:
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def submit_rows(
+        self,
+        primary: ModelBundle,
+        features_list: Sequence[InputFeatures],
+        risks: Sequence[Optional[int]],
+        probabilities: Sequence[Optional[float]]
+    ) -> None:
+        """Queue rows the primary model scored (None marks rows it could not score)"""
+        if self._shadow_for(primary) is None:
+            return
+        self._enqueue(("rows", primary.version, list(features_list), list(risks), list(probabilities)))
+
+    def submit_columns(
+        self,
+        primary: ModelBundle,
+        columns: Mapping[str, np.ndarray],
+        risks: np.ndarray,
+        probabilities: np.ndarray
+    ) -> None:
+        """Queue validated feature columns the primary model scored"""
+        if self._shadow_for(primary) is None:
+            return
+        self._enqueue(("columns", primary.version, columns, risks, probabilities))
+
+    def _run(self) -> None:
+        while True:
+            kind, primary_version, inputs, risks, probabilities = self._queue.get()
+            registry = ModelRepository.get_registry()
+            shadow = registry.shadow if registry is not None else None
+            if shadow is None or shadow.version == primary_version:
+                continue
+            try:
+                self._compare(shadow, kind, primary_version, inputs, risks, probabilities)
+            except Exception as e:
+                logger.warning("Shadow model %s failed to score: %s", shadow.version, e)
+                with self._lock:
+                    self._errors += 1
+
+    def _compare(self, shadow: ModelBundle, kind: str, primary_version: str, inputs: Any, risks: Any, probabilities: Any) -> None:
+        pipeline = shadow.pipeline
+        if kind == "rows":
+            scored = [i for i, p in enumerate(probabilities) if p is not None]
+            if not scored:
+                return
+            rows = [inputs[i] for i in scored]
+            shadow_probabilities = pipeline.score(pipeline.transform(rows))
+            shadow_risks = pipeline.decide(shadow_probabilities, rows)
+            primary_probabilities = np.array([probabilities[i] for i in scored], dtype=np.float64)
+            primary_risks = np.array([risks[i] for i in scored], dtype=np.int64)
+        else:
+            shadow_probabilities = pipeline.score(pipeline.transform_columns(inputs))
+            shadow_risks = pipeline.decide_columns(shadow_probabilities, inputs)
+            primary_probabilities, primary_risks = probabilities, risks
+
+        diff = np.abs(shadow_probabilities - primary_probabilities)
+        disagreements = int((shadow_risks != primary_risks).sum())
+        with self._lock:
+            counters = self._comparisons.setdefault((primary_version, shadow.version), [0, 0, 0.0, 0.0])
+            counters[0] += len(diff)
+            counters[1] += disagreements
+            counters[2] += float(diff.sum())
+            counters[3] = max(counters[3], float(diff.max()))
+
+    def stats(self) -> ShadowStats:
+        """Disagreement counters since startup, per primary/shadow version pair"""
+        registry = ModelRepository.get_registry()
+        shadow_version = registry.shadow_version if registry is not None else None
+        with self._lock:
+            comparisons = [
+                ShadowComparison(
+                    primary_version=primary,
+                    shadow_version=shadow,
+                    rows=int(rows),
+                    risk_disagreements=int(disagreements),
+                    disagreement_rate=disagreements / rows if rows else 0.0,
+                    mean_abs_probability_diff=diff_sum / rows if rows else 0.0,
+                    max_abs_probability_diff=diff_max
+                )
+                for (primary, shadow), (rows, disagreements, diff_sum, diff_max) in self._comparisons.items()
+            ]
+            return ShadowStats(
+                enabled=shadow_version is not None,
+                shadow_version=shadow_version,
+                pending=self._queue.qsize(),
+                dropped=self._dropped,
+                errors=self._errors,
+                comparisons=comparisons
+            )
+
+shadow_scorer = ShadowScorer(max_queue=Settings.SHADOW_QUEUE_SIZE)
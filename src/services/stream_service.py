@@ -0,0 +1,205 @@
+import codecs
+import csv
+import io
+import json
+from collections import deque
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from pydantic import ValidationError
+from models.health import InputFeatures
+from models.batch import BatchPredictionResult
+from services.prediction_service import PredictionService
+from repositories.model_repository import ModelRepository
+from services.inference_executor import inference_executor
+from services import telemetry
+import logging
+
+logger = logging.getLogger(__name__)
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+OUTPUT_FIELDS = ["row", "risk", "probability", "model_version", "confidence", "error"]
+
+class _LineFeed:
+    """Line iterator that a csv.reader pulls from while lines are pushed in as they arrive"""
+
+    def __init__(self):
+        self.lines: "deque[str]" = deque()
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+class StreamingPredictionService:
+    """Chunked NDJSON/CSV scoring with flat memory use
+
+    The request body is consumed as it arrives, ``chunk_rows`` patients at a
+    time. Each chunk is scored with the vectorized ``predict_many`` path on the
+    inference executor and written out before the next one is read, so memory
+    does not grow with the number of uploaded rows.
+    """
+
+    @staticmethod
+    def media_type(content_type: Optional[str]) -> Optional[str]:
+        """Normalized stream format for a Content-Type header, None if unsupported"""
+        value = (content_type or "").split(";")[0].strip().lower()
+        if value in (NDJSON, "application/ndjson", "application/jsonl", "application/json-lines"):
+            return NDJSON
+        if value in (CSV, "application/csv"):
+            return CSV
+        return None
+
+    @staticmethod
+    async def iter_lines(byte_stream: AsyncIterator[bytes], keepends: bool = False) -> AsyncIterator[str]:
+        """Split an async byte stream into text lines without buffering the body
+
+        With ``keepends`` each line keeps its ``\n`` or ``\r\n`` terminator.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        remainder = ""
+        async for chunk in byte_stream:
+            text = remainder + decoder.decode(chunk)
+            lines = text.split("\n")
+            remainder = lines.pop()
+            for line in lines:
+                yield line + "\n" if keepends else line.rstrip("\r")
+        remainder += decoder.decode(b"", final=True)
+        if remainder:
+            yield remainder if keepends else remainder.rstrip("\r")
+
+    @staticmethod
+    async def iter_csv_records(byte_stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[Optional[List[str]], Optional[str]]]:
+        """CSV records as ``(values, None)``, or ``(None, error)`` for a malformed record
+
+        All lines go through one incremental ``csv.reader``, so a quoted field
+        may span lines (RFC 4180). Lines are collected until their quote
+        count is even, i.e. the record is complete, before the reader is
+        asked for it. Blank lines between records are skipped.
+        """
+        feed = _LineFeed()
+        reader = csv.reader(feed)
+        quotes = 0
+        async for line in StreamingPredictionService.iter_lines(byte_stream, keepends=True):
+            if not feed.lines and not line.strip():
+                continue
+            feed.lines.append(line)
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+            quotes = 0
+            try:
+                yield next(reader), None
+            except csv.Error as e:
+                feed.lines.clear()
+                yield None, f"Malformed CSV record: {e}"
+        if feed.lines:
+            # The body ended inside a quoted field; the reader returns what it has
+            try:
+                yield next(reader), None
+            except csv.Error as e:
+                yield None, f"Malformed CSV record: {e}"
+
+    @staticmethod
+    def parse_ndjson(line: str) -> InputFeatures:
+        return InputFeatures(**json.loads(line))
+
+    @staticmethod
+    def parse_csv(values: List[str], header: List[str]) -> InputFeatures:
+        if len(values) != len(header):
+            raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+        return InputFeatures(**dict(zip(header, values)))
+
+    @staticmethod
+    def format_error(e: Exception) -> str:
+        if isinstance(e, ValidationError):
+            return "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+        return str(e)
+
+    @staticmethod
+    async def score_stream(
+        byte_stream: AsyncIterator[bytes],
+        media_type: str,
+        chunk_rows: int,
+        model_version: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Parse, score and serialize the uploaded rows chunk by chunk"""
+        header: Optional[List[str]] = None
+        pending: List[Tuple[int, Optional[InputFeatures], Optional[str]]] = []
+        row = 0
+        # One CSV writer and buffer for the whole stream, emptied after every chunk
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if media_type == CSV:
+            writer.writerow(OUTPUT_FIELDS)
+            yield StreamingPredictionService._drain(buffer)
+
+        if media_type == CSV:
+            records = StreamingPredictionService.iter_csv_records(byte_stream)
+        else:
+            records = ((line, None) async for line in StreamingPredictionService.iter_lines(byte_stream) if line.strip())
+        async for record, error in records:
+            if media_type == CSV and header is None and error is None:
+                header = [name.strip() for name in record]
+                continue
+            if error is not None:
+                pending.append((row, None, error))
+            else:
+                try:
+                    if media_type == CSV:
+                        features = StreamingPredictionService.parse_csv(record, header)
+                    else:
+                        features = StreamingPredictionService.parse_ndjson(record)
+                    pending.append((row, features, None))
+                except Exception as e:
+                    pending.append((row, None, StreamingPredictionService.format_error(e)))
+            row += 1
+
+            if len(pending) >= chunk_rows:
+                telemetry.mark("parse")
+                yield await StreamingPredictionService._score_chunk(pending, media_type, writer, buffer, model_version)
+                pending = []
+
+        if pending:
+            telemetry.mark("parse")
+            yield await StreamingPredictionService._score_chunk(pending, media_type, writer, buffer, model_version)
+        logger.info("Streamed predictions for %d rows", row)
+
+    @staticmethod
+    async def _score_chunk(
+        pending: List[Tuple[int, Optional[InputFeatures], Optional[str]]],
+        media_type: str,
+        writer: Any,
+        buffer: io.StringIO,
+        model_version: Optional[str] = None
+    ) -> bytes:
+        valid = [features for _, features, error in pending if error is None]
+        scored = iter(await inference_executor.submit(PredictionService.predict_many, valid, model_version) if valid else [])
+        model_version = ModelRepository.get_model_info(model_version)["version"]
+
+        out = []
+        for row, _, error in pending:
+            if error is None:
+                result = next(scored)
+            else:
+                result = BatchPredictionResult(model_version=model_version, error=error)
+            record = {"row": row, **result.model_dump()}
+            if media_type == CSV:
+                writer.writerow([record[field] for field in OUTPUT_FIELDS])
+            else:
+                out.append(json.dumps(record) + "\n")
+        body = StreamingPredictionService._drain(buffer) if media_type == CSV else "".join(out).encode()
+        telemetry.mark("serialize")
+        return body
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> bytes:
+        """The buffer's contents as UTF-8, leaving it empty for reuse"""
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text.encode()
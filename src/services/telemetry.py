@@ -0,0 +1,254 @@
+"""
+Low-overhead request telemetry: per-stage timings and Prometheus histograms
+
+A ``StageTimings`` is bound to each request (a context variable, copied into
+the inference threads) and services mark the end of each stage with
+``mark``: one ``perf_counter`` call and one list append. The middleware
+observes the laps into histograms when the response has been sent; a stage
+marked more than once (streamed chunks) is observed once per lap. Everything is
+rendered in the Prometheus text format on ``/ops/metrics``.
+"""
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Stage laps are sub-millisecond to tens of milliseconds; batches run longer
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class StageTimings:
+    """Monotonic per-stage laps for one request
+
+    ``mark(stage)`` only stores the stage name and a ``perf_counter``
+    timestamp; a stage lasts from the previous mark (or the request start)
+    to its own. Durations are computed when they are read.
+    """
+
+    __slots__ = ("started", "marks", "model_version")
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = perf_counter() if started is None else started
+        self.marks: List[Tuple[str, float]] = []
+        self.model_version: Optional[str] = None
+
+    def mark(self, stage: str) -> None:
+        self.marks.append((stage, perf_counter()))
+
+    @property
+    def stages(self) -> List[Tuple[str, float]]:
+        """(stage, seconds) laps in mark order; a stage marked twice appears twice"""
+        laps = []
+        previous = self.started
+        for stage, at in self.marks:
+            laps.append((stage, at - previous))
+            previous = at
+        return laps
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per stage, in first-seen order"""
+        totals: Dict[str, float] = {}
+        for stage, seconds in self.stages:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+    
+    def server_timing(self, end: float) -> str:
+        """``Server-Timing`` header value: milliseconds per stage, plus ``total`` up to ``end``"""
+        metrics = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in self.totals().items()]
+        metrics.append(f"total;dur={(end - self.started) * 1000:.3f}")
+        return ", ".join(metrics)
+
+_current: ContextVar[Optional[StageTimings]] = ContextVar("glucotrack_stage_timings", default=None)
+
+def start_request() -> StageTimings:
+    """Bind a fresh StageTimings to the current context"""
+    timings = StageTimings()
+    _current.set(timings)
+    return timings
+
+def current() -> Optional[StageTimings]:
+    return _current.get()
+
+def mark(stage: str) -> None:
+    """End ``stage`` for the current request (no-op outside a request)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.marks.append((stage, perf_counter()))
+
+def stage_milliseconds() -> Optional[Dict[str, float]]:
+    """Milliseconds per stage marked so far in the current request (None outside a request)"""
+    timings = _current.get()
+    if timings is None:
+        return None
+    return {stage: round(seconds * 1000, 3) for stage, seconds in timings.totals().items()}
+
+def set_model_version(version: str) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.model_version = version
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for v in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Histogram:
+    """Prometheus histogram with one series per label combination"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        # prefix -> last label -> the same series lists, so laps skip building label tuples
+        self._by_prefix: Dict[Tuple[str, ...], Dict[str, List]] = {}
+
+    def _get_series(self, labels: Tuple[str, ...]) -> List:
+        # Callers hold the lock
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        return series
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._get_series(labels)
+            series[0][index] += 1
+            series[1] += value
+
+    def observe_laps(self, prefix: Tuple[str, ...], started: float, marks: Sequence[Tuple[str, float]]) -> None:
+        """Observe ``(label, timestamp)`` marks as laps, labelled ``prefix + (label,)``, under one lock"""
+        buckets = self.buckets
+        previous = started
+        with self._lock:
+            children = self._by_prefix.get(prefix)
+            if children is None:
+                children = self._by_prefix[prefix] = {}
+            for label, at in marks:
+                seconds = at - previous
+                previous = at
+                series = children.get(label)
+                if series is None:
+                    series = children[label] = self._get_series(prefix + (label,))
+                series[0][bisect_left(buckets, seconds)] += 1
+                series[1] += seconds
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), labels + (le,))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {repr(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+class Counter:
+    """Prometheus counter with one series per label combination"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = sorted(self._series.items())
+        for labels, value in snapshot:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+# (labels, value) pairs read when the endpoint is scraped
+Samples = Iterable[Tuple[Tuple[str, ...], float]]
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from live state at scrape time"""
+
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Sequence[str], collect: Callable[[], Samples]):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in self.collect():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+class MetricsRegistry:
+    """Ordered set of metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Decorator registering a function returning ``(labels, value)`` samples as a gauge"""
+        def decorator(collect: Callable[[], Samples]) -> Callable[[], Samples]:
+            self.register(CallbackMetric(name, documentation, "gauge", labelnames, collect))
+            return collect
+        return decorator
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Decorator registering a function returning ``(labels, value)`` samples as a counter"""
+        def decorator(collect: Callable[[], Samples]) -> Callable[[], Samples]:
+            self.register(CallbackMetric(name, documentation, "counter", labelnames, collect))
+            return collect
+        return decorator
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                # One broken collector must not take the whole scrape down
+                lines.append(f"# {metric.name} unavailable")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+stage_seconds = registry.register(Histogram(
+    "glucotrack_stage_duration_seconds",
+    "Time spent per request in each pipeline stage",
+    ("endpoint", "stage"),
+    STAGE_BUCKETS
+))
+request_seconds = registry.register(Histogram(
+    "glucotrack_request_duration_seconds",
+    "Time from request start until the response is sent",
+    ("endpoint", "model_version", "status"),
+    REQUEST_BUCKETS
+))
+
+STATUS_LABELS = {status: str(status) for status in range(100, 600)}
+
+def observe(endpoint: str, timings: StageTimings, status: int) -> None:
+    """Record a finished request's stage laps and total duration"""
+    stage_seconds.observe_laps((endpoint,), timings.started, timings.marks)
+    request_seconds.observe(perf_counter() - timings.started, (endpoint, timings.model_version or "", STATUS_LABELS.get(status) or str(status)))
@@ -1,71 +1,143 @@
+import operator
+from dataclasses import dataclass
 from models.health import InputFeatures, ValidationResult
-from typing import List
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+OPERATORS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    "<": operator.lt,
+    ">": operator.gt,
+    "==": operator.eq,
+}
+
+@dataclass(frozen=True)
+class BusinessRule:
+    """A warning raised when every ``(field, operator, value)`` condition holds"""
+
+    message: str
+    conditions: Tuple[Tuple[str, str, float], ...]
+
+# Business rules, checked after Pydantic validation; warnings are reported in this order
+WARNING_RULES: Tuple[BusinessRule, ...] = (
+    # Age validation
+    BusinessRule("Patient is under 18 years old", (("age", "<", 18),)),
+    BusinessRule("Patient is over 100 years old - verify data accuracy", (("age", ">", 100),)),
+    # BMI validation
+    BusinessRule("BMI is very low (< 15) - check measurement accuracy", (("bmi", "<", 15),)),
+    BusinessRule("BMI is very high (> 50) - verify measurement", (("bmi", ">", 50),)),
+    # Blood glucose validation
+    BusinessRule("Blood glucose level is low - patient might be hypoglycemic", (("blood_glucose_level", "<", 70),)),
+    BusinessRule(
+        "Blood glucose level is very high - immediate medical attention may be needed",
+        (("blood_glucose_level", ">", 300),)
+    ),
+    # HbA1c validation
+    BusinessRule("HbA1c level is very high - indicates poor glucose control", (("HbA1c_level", ">", 10),)),
+    # Logical consistency checks
+    BusinessRule("Heart disease in patient under 30 is uncommon - verify data", (("age", "<", 30), ("heart_disease", "==", 1))),
+    BusinessRule("Hypertension in patient under 25 is uncommon - verify data", (("age", "<", 25), ("hypertension", "==", 1))),
+)
+
+class RuleSet:
+    """Business rules compiled into vectorized masks over feature columns
+
+    Each rule is evaluated once over the whole batch; per-row messages are
+    only built for the rows where a mask fires. ``check`` evaluates the same
+    compiled conditions on a single patient without NumPy overhead.
+    """
+
+    def __init__(self, rules: Sequence[BusinessRule]):
+        self.rules = tuple(rules)
+        self.fields = tuple(dict.fromkeys(field for rule in self.rules for field, _, _ in rule.conditions))
+        self._compiled = [
+            [(field, OPERATORS[op], value) for field, op, value in rule.conditions]
+            for rule in self.rules
+        ]
+
+    def masks(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """(n_rules, n_rows) boolean matrix: where each rule fires"""
+        n_rows = len(columns[self.fields[0]]) if self.fields else 0
+        masks = np.ones((len(self.rules), n_rows), dtype=bool)
+        for row, conditions in zip(masks, self._compiled):
+            for field, compare, value in conditions:
+                row &= compare(columns[field], value)
+        return masks
+
+    def messages(self, columns: Mapping[str, np.ndarray]) -> List[List[str]]:
+        """The messages of the rules that fire, per row and in rule order"""
+        masks = self.masks(columns)
+        messages: List[List[str]] = [[] for _ in range(masks.shape[1])]
+        # Row-major nonzero: (row, rule) pairs sorted by row, then rule
+        rows, rules = np.nonzero(masks.T)
+        for row, rule in zip(rows.tolist(), rules.tolist()):
+            messages[row].append(self.rules[rule].message)
+        return messages
+
+    def columns(self, features_list: Sequence[InputFeatures]) -> Dict[str, np.ndarray]:
+        """The columns the rules read, gathered from validated inputs"""
+        n_rows = len(features_list)
+        return {
+            field: np.fromiter(map(operator.attrgetter(field), features_list), dtype=np.float64, count=n_rows)
+            for field in self.fields
+        }
+
+    def check(self, features: InputFeatures) -> List[str]:
+        """The messages of the rules that fire for one patient"""
+        return [
+            rule.message
+            for rule, conditions in zip(self.rules, self._compiled)
+            if all(compare(getattr(features, field), value) for field, compare, value in conditions)
+        ]
+
+warning_rules = RuleSet(WARNING_RULES)
+
+# Below this many rows, per-row checks beat the fixed cost of the vectorized pass
+VECTORIZE_MIN_ROWS = 8
+
 class ValidationService:
     """Service for validating input data without making predictions"""
     
     @staticmethod
     def validate_features(features: InputFeatures) -> ValidationResult:
         """Validate input features against schema and business rules"""
-        errors = []
-        warnings = []
-        
         try:
             # Basic Pydantic validation already happened if we got here
-            # Add additional business rule validations
-            
-            # Age validation
-            if features.age < 18:
-                warnings.append("Patient is under 18 years old")
-            elif features.age > 100:
-                warnings.append("Patient is over 100 years old - verify data accuracy")
-            
-            # BMI validation
-            if features.bmi < 15:
-                warnings.append("BMI is very low (< 15) - check measurement accuracy")
-            elif features.bmi > 50:
-                warnings.append("BMI is very high (> 50) - verify measurement")
-            
-            # Blood glucose validation
-            if features.blood_glucose_level < 70:
-                warnings.append("Blood glucose level is low - patient might be hypoglycemic")
-            elif features.blood_glucose_level > 300:
-                warnings.append("Blood glucose level is very high - immediate medical attention may be needed")
-            
-            # HbA1c validation
-            if features.HbA1c_level > 10:
-                warnings.append("HbA1c level is very high - indicates poor glucose control")
-            
-            # Logical consistency checks
-            if features.age < 30 and features.heart_disease == 1:
-                warnings.append("Heart disease in patient under 30 is uncommon - verify data")
-            
-            if features.age < 25 and features.hypertension == 1:
-                warnings.append("Hypertension in patient under 25 is uncommon - verify data")
-            
-            return ValidationResult(
-                valid=len(errors) == 0,
-                errors=errors,
-                warnings=warnings
-            )
-            
+            warnings = warning_rules.check(features)
         except Exception as e:
             logger.error(f"Error during validation: {e}")
-            errors.append(f"Validation error: {str(e)}")
-            return ValidationResult(
-                valid=False,
-                errors=errors,
-                warnings=warnings
-            )
+            return ValidationResult(valid=False, errors=[f"Validation error: {str(e)}"], warnings=[])
+        return ValidationResult(valid=True, errors=[], warnings=warnings)
     
     @staticmethod
     def validate_batch(features_list: List[InputFeatures]) -> List[ValidationResult]:
-        """Validate a batch of input features"""
-        results = []
-        for features in features_list:
-            result = ValidationService.validate_features(features)
-            results.append(result)
-        return results
+        """Validate a batch of input features with one vectorized pass per rule"""
+        return [ValidationResult(**result) for result in ValidationService.validate_batch_payload(features_list)]
+    
+    @staticmethod
+    def validate_batch_payload(features_list: List[InputFeatures]) -> List[Dict[str, Any]]:
+        """Batch validation results as JSON-ready dicts, skipping per-row model construction"""
+        try:
+            # Basic Pydantic validation already happened if we got here
+            warnings = ValidationService.warnings_for(features_list)
+        except Exception as e:
+            logger.error(f"Error during validation: {e}")
+            return [
+                {"valid": False, "errors": [f"Validation error: {str(e)}"], "warnings": []}
+                for _ in features_list
+            ]
+        return [{"valid": True, "errors": [], "warnings": row} for row in warnings]
+    
+    @staticmethod
+    def warnings_for(features_list: Sequence[InputFeatures]) -> List[List[str]]:
+        """Business rule warnings per patient"""
+        if len(features_list) < VECTORIZE_MIN_ROWS:
+            return [warning_rules.check(features) for features in features_list]
+        return warning_rules.messages(warning_rules.columns(features_list))
+    
+    @staticmethod
+    def warnings_for_columns(columns: Mapping[str, np.ndarray]) -> List[List[str]]:
+        """Business rule warnings per row of already validated feature columns"""
+        return warning_rules.messages(columns)
@@ -4,7 +4,9 @@ Test script for GlucoTrack API endpoints
 """
 import requests
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # API base URL
 BASE_URL = "http://localhost:8000/api/v1"
@@ -152,6 +154,48 @@ def test_validation_endpoints():
     except Exception as e:
         print(f"❌ Data validation failed: {e}")
 
+def test_profiling_endpoints():
+    """Test that profiled requests are still served while another profile is active"""
+    print("\n⏱️  Testing Request Profiling...")
+    
+    admin_token = os.getenv("GLUCOTRACK_ADMIN_TOKEN")
+    if not admin_token:
+        print("⏭️  Skipped: set GLUCOTRACK_ADMIN_TOKEN to the server's admin token")
+        return
+    
+    sample_patient = {
+        "gender": "Female",
+        "age": 45.0,
+        "hypertension": 0,
+        "heart_disease": 0,
+        "smoking_history": "never",
+        "bmi": 28.5,
+        "HbA1c_level": 6.2,
+        "blood_glucose_level": 140.0
+    }
+    
+    # Overlapping profiled requests: one is profiled, the others are served with X-Profile-Skipped
+    def profiled_predict(_):
+        return requests.post(
+            f"{BASE_URL}/predict",
+            json=sample_patient,
+            headers={"X-Profile": "1", "X-Admin-Token": admin_token}
+        )
+    
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            responses = list(pool.map(profiled_predict, range(4)))
+        statuses = [response.status_code for response in responses]
+        profiled = sum("X-Profile-Id" in response.headers for response in responses)
+        skipped = sum("X-Profile-Skipped" in response.headers for response in responses)
+        if all(status == 200 for status in statuses):
+            print(f"✅ Concurrent Profiled Predictions: {statuses}")
+        else:
+            print(f"❌ Concurrent Profiled Predictions: {statuses}")
+        print(f"   Profiled: {profiled}, Skipped: {skipped}")
+    except Exception as e:
+        print(f"❌ Profiled prediction failed: {e}")
+
 def main():
     """Run all tests"""
     print("🧪 GlucoTrack API Test Suite")
@@ -162,6 +206,7 @@ def main():
         test_model_endpoints()
         test_prediction_endpoints()
         test_validation_endpoints()
+        test_profiling_endpoints()
         
         print("\n🎉 Test suite completed!")
         print("💡 Check the API documentation at: http://localhost:8000/docs")
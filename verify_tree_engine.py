@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Parity check for the native numpy tree engine
+
+Scores the preprocessed test split with the stock LightGBM model and with
+TreeEnsembleEngine and fails if any probability differs by more than 1e-9.
+"""
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from ml.tree_engine import TreeEnsembleEngine
+
+MODEL_PATH = 'models/lgbm_best_model.pkl'
+X_TEST_PATH = 'data/processed/X_test_ml.csv'
+TOLERANCE = 1e-9
+
+def main():
+    model = joblib.load(MODEL_PATH)
+    X_test = pd.read_csv(X_TEST_PATH)
+    X_test.columns = model.feature_name_
+    print(f"Loaded model and test split: {X_test.shape[0]} rows x {X_test.shape[1]} features")
+
+    engine = TreeEnsembleEngine(model)
+    print(f"Exported {engine.n_trees} trees, {len(engine.feature)} nodes, max depth {engine.max_depth}")
+
+    X = X_test.to_numpy(dtype=np.float64)
+    expected_raw = model.booster_.predict(X, raw_score=True)
+    expected = model.predict_proba(X_test)[:, 1]
+    raw_diff = np.abs(engine.raw_score(X) - expected_raw).max()
+    proba_diff = np.abs(engine.score(X) - expected).max()
+    print(f"Max |raw score diff|:   {raw_diff:.3e}")
+    print(f"Max |probability diff|: {proba_diff:.3e}")
+
+    # Missing values must follow the same default-direction rules
+    X_missing = X.copy()
+    rng = np.random.default_rng(42)
+    X_missing[rng.random(X.shape) < 0.1] = np.nan
+    missing_diff = np.abs(engine.score(X_missing) - model.booster_.predict(X_missing)).max()
+    print(f"Max |probability diff| with NaNs: {missing_diff:.3e}")
+
+    if max(raw_diff, proba_diff, missing_diff) > TOLERANCE:
+        print(f"❌ Native engine differs from LightGBM by more than {TOLERANCE}")
+        sys.exit(1)
+    print(f"✅ Native engine matches LightGBM within {TOLERANCE}")
+
+if __name__ == "__main__":
+    main()